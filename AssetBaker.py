@@ -0,0 +1,51 @@
+"""
+Bakes display-size variants of the image assets displayed by the widgets of configs
+Widgets load the baked variants directly, so they skip decoding and resampling the images when they start and redraw
+
+Usage: python AssetBaker.py [--config config/config.json ...] [--prune]
+"""
+import argparse
+import pathlib
+from HeadlessLayout import HeadlessLayoutManager
+from SmartMirror import SmartMirror
+from Widgets import WidgetConstructor
+from Widgets.AssetCache import AssetCache
+
+
+def get_assets(config: {}) -> {(str, (int, int))}:
+    """returns the (path, (width, height)) pairs of the images displayed by the widgets in the config"""
+    layout_manager = HeadlessLayoutManager(config)
+    rects = layout_manager.get_rects()
+    assets = set()
+    for widget_id, widget in layout_manager.widgets.items():
+        widget_type = WidgetConstructor.widgets.get(widget.name, None)
+        if widget_type is not None and hasattr(widget_type, "get_assets"):
+            assets.update(widget_type.get_assets(widget.props, rects[widget_id]))
+    return assets
+
+
+def bake(config_paths: [pathlib.Path], prune: bool = False) -> [pathlib.Path]:
+    """
+    bakes the assets of every config and returns the paths of the variants
+
+    :param prune: if True, variants in the cache that none of the configs need are deleted
+    """
+    assets = set()
+    for config_path in config_paths:
+        assets.update(get_assets(SmartMirror.parse_json(config_path)))
+    variants = [AssetCache.bake(path, size) for path, size in sorted(assets)]
+    if prune and AssetCache.cache_path.exists():
+        for variant in AssetCache.cache_path.glob("*.rgba"):
+            if variant not in variants:
+                variant.unlink()
+                print(f"Pruned {variant}")
+    return variants
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bakes display-size variants of the image assets used by configs")
+    parser.add_argument("--config", type=pathlib.Path, nargs="+", default=[pathlib.Path("config/config.json")])
+    parser.add_argument("--prune", action="store_true", help="deletes baked variants that none of the configs need")
+    args = parser.parse_args()
+    for baked_variant in bake(args.config, args.prune):
+        print(f"Baked {baked_variant}")
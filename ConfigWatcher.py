@@ -0,0 +1,113 @@
+from collections import OrderedDict
+import json
+import pathlib
+
+
+class ConfigDiff:
+    """
+    Object that describes the difference between two configs
+    Widgets are matched between the configs by their id, or by their entire definition if they have no id
+    """
+    # sections that are only read when the SmartMirror is constructed
+    restart_section_names = ["network archive", "memory profiler"]
+
+    @staticmethod
+    def get_widget_key(widget_config: {}) -> str:
+        """returns the key used to match the widget_config with the same widget's config in another config"""
+        widget_id = widget_config.get("props", {}).get("id", None)
+        if widget_id is None:
+            return json.dumps(widget_config, sort_keys=True)
+        return str(widget_id)
+
+    def __init__(self, old_config: {}, new_config: {}):
+        """
+        Computes the difference between old_config and new_config
+
+        window_changed, colors_changed, fonts_changed, power_changed, pages_changed are True if the corresponding section of the config changed
+        restart_sections are the changed sections that are only applied when the SmartMirror is constructed again
+        font_family_changed is True if the family of the fonts changed, which text fitted to the widgets must be fitted to again
+        removed is a list of keys of the widgets that no longer exist
+        added maps the keys of the new widgets to their configs
+        rebuilt maps the keys of the widgets that must be constructed again to their new configs
+        constraints_changed maps the keys of the widgets where only the constraints changed to their new constraints
+        """
+        self.window_changed = old_config["window_config"] != new_config["window_config"]
+        self.colors_changed = old_config["colors"] != new_config["colors"]
+        self.fonts_changed = old_config["fonts"] != new_config["fonts"]
+        self.font_family_changed = old_config["fonts"]["type"] != new_config["fonts"]["type"]
+        # fonts are reconfigured in place, except for removed sizes, which the widgets that display them must stop using
+        font_sizes_removed = any(size not in new_config["fonts"]["sizes"] for size in old_config["fonts"]["sizes"])
+        self.power_changed = old_config.get("power", {}) != new_config.get("power", {})
+        self.pages_changed = old_config.get("pages", {}) != new_config.get("pages", {})
+        self.restart_sections: [str] = [section for section in ConfigDiff.restart_section_names if old_config.get(section, None) != new_config.get(section, None)]
+
+        old_widgets = OrderedDict((ConfigDiff.get_widget_key(w), w) for w in old_config["widgets"])
+        new_widgets = OrderedDict((ConfigDiff.get_widget_key(w), w) for w in new_config["widgets"])
+        self.removed: [str] = [key for key in old_widgets if key not in new_widgets]
+        self.added: {str: {}} = OrderedDict((key, w) for key, w in new_widgets.items() if key not in old_widgets)
+        self.rebuilt: {str: {}} = OrderedDict()
+        self.constraints_changed: {str: [str]} = OrderedDict()
+        for key, new_widget in new_widgets.items():
+            if key not in old_widgets:
+                continue
+            old_widget = old_widgets[key]
+            if font_sizes_removed or ConfigDiff.without_constraints(old_widget) != ConfigDiff.without_constraints(new_widget):
+                self.rebuilt[key] = new_widget
+            elif old_widget["constraints"] != new_widget["constraints"]:
+                self.constraints_changed[key] = new_widget["constraints"]
+
+    @staticmethod
+    def without_constraints(widget_config: {}) -> {}:
+        """returns a copy of the widget's config without its constraints"""
+        return {key: value for key, value in widget_config.items() if key != "constraints"}
+
+    def is_empty(self) -> bool:
+        """returns True if applying the diff would not change anything"""
+        return not (self.window_changed or self.colors_changed or self.fonts_changed or self.power_changed or self.pages_changed
+                    or self.removed or self.added or self.rebuilt or self.constraints_changed)
+
+    def __str__(self) -> str:
+        """gives details about the changed sections and widgets"""
+        return f"\n\tWindow Changed = {self.window_changed}\n\tColors Changed = {self.colors_changed}\n\tFonts Changed = {self.fonts_changed}\n\tPower Changed = {self.power_changed}\n\tPages Changed = {self.pages_changed}" \
+            f"\n\tRemoved = {self.removed}\n\tAdded = {list(self.added)}\n\tRebuilt = {list(self.rebuilt)}\n\tConstraints Changed = {list(self.constraints_changed)}"
+
+
+class ConfigWatcher:
+    """Class used to watch the config file and apply its changes to the running SmartMirror"""
+
+    def __init__(self, smart_mirror, json_path: pathlib.Path or str):
+        """
+        Initializes a ConfigWatcher that applies changes of the file at json_path to smart_mirror
+
+        :param smart_mirror: should have the methods parse_json and apply_config
+        """
+        self.smart_mirror = smart_mirror
+        self.json_path = pathlib.Path(json_path)
+        self.last_modified = self.get_modified_time()
+
+    def get_modified_time(self) -> int:
+        """returns the time the config file was last modified, or None if it does not exist"""
+        try:
+            return self.json_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def check_for_changes(self) -> None:
+        """
+        if the config file was modified since the last check, the new config is applied to the SmartMirror
+        a config that can't be parsed, has errors or fails to apply is ignored until the file is modified again
+        """
+        modified = self.get_modified_time()
+        if modified is None or modified == self.last_modified:
+            return
+        self.last_modified = modified
+        try:
+            config = self.smart_mirror.parse_json(self.json_path)
+        except ValueError as e:
+            print(f"Config file {self.json_path} could not be parsed and will be ignored:\n\t{e}")
+            return
+        try:
+            self.smart_mirror.apply_config(config)
+        except Exception as e:
+            # raised while restoring the running config, see SmartMirror.apply_config
+            print(f"Config file {self.json_path} could not be applied:\n\t{type(e).__name__}: {e}")
@@ -0,0 +1,185 @@
+from collections import OrderedDict
+import tkinter
+from LayoutManager import LayoutManager
+from Widgets.BaseWidget import LayoutManagerHelper
+
+
+class WidgetStub(LayoutManagerHelper):
+    """Stands in for a widget in a HeadlessLayoutManager: it has the widget's config and dimensions but no tkinter frame"""
+
+    def __init__(self, layout_manager, parent, widget_config: {}):
+        """
+        constructs a stub for the widget defined by widget_config and stubs for its subwidgets
+
+        :param parent: the stub of the widget's parent widget, or None if the widget has no parent widget
+        """
+        LayoutManagerHelper.__init__(self)
+        self.layout_manager = layout_manager
+        self.parent = parent
+        self.name = widget_config["name"]
+        self.props = widget_config.get("props", {})
+        self.constraints = widget_config.get("constraints", [])
+        self.id = self.props.get("id", None)
+        self.subwidgets = [WidgetStub(layout_manager, self, subwidget) for subwidget in widget_config.get("subwidgets", [])]
+
+    def get_id(self) -> str:
+        """see BaseWidget.get_id"""
+        if self.id is None:
+            self.id = self.layout_manager.get_unused_id(self)
+        return self.id
+
+    def __str__(self) -> str:
+        return f"WidgetStub({self.name}, id={self.id}, rect={self.get_rect()})"
+
+
+class HeadlessLayoutManager(LayoutManager):
+    """
+    LayoutManager that evaluates the constraints of a config without a tkinter window or any widgets
+    Used by tools that need the layout of a config without running the SmartMirror
+    """
+
+    def __init__(self, config: {}):
+        """constructs a stub for each widget in the config and adds its constraints"""
+        self.widgets: {str: WidgetStub} = OrderedDict()
+        LayoutManager.__init__(self, self, config["window_config"], config["colors"], config["fonts"])
+        for widget_config in config["widgets"]:
+            self.add_widget(WidgetStub(self, None, widget_config))
+
+    def create_window(self) -> None:
+        """a headless layout has no window"""
+        return None
+
+    def configure_window(self) -> None:
+        """a headless layout has no window"""
+        pass
+
+    def add_widget(self, widget: WidgetStub) -> None:
+        """adds the stub, its constraints and its subwidgets' stubs"""
+        widget_id = widget.get_id()
+        assert widget_id not in self.widgets, f"Error, ID already added\nAddedID = {widget_id}"
+        self.widgets[widget_id] = widget
+        self.add_str_constraints(widget.constraints)
+        for subwidget in widget.subwidgets:
+            self.add_widget(subwidget)
+
+    def get_unused_id(self, widget: WidgetStub) -> str:
+        """see LayoutManager.get_unused_id, the ID is based on the name of the widget the stub stands in for"""
+        i = 1
+        while f"{widget.name}_[{i}]" in self.widgets.keys():
+            i += 1
+        return f"{widget.name}_[{i}]"
+
+    def get_rects(self) -> {str: ((int, int), (int, int))}:
+        """evaluates the constraints and returns the rectangle of each widget, see LayoutManagerHelper.get_rect"""
+        self.evaluate_constraints()
+        return OrderedDict((widget_id, widget.get_rect()) for widget_id, widget in self.widgets.items())
+
+
+# Tcl commands that stand in for the commands of Tk: widgets and images remember their options so that cget works,
+# geometry managers and window manager commands do nothing, and text is measured from the length of the text
+headless_tk_script = r"""
+namespace eval headless {
+    variable images {}
+    variable image_count 0
+}
+proc headless::create {path args} {
+    set ::headless::options($path) [dict create]
+    headless::command $path configure {*}$args
+    proc ::$path {command args} "headless::command [list $path] \$command {*}\$args"
+    return $path
+}
+proc headless::command {path command args} {
+    switch -- $command {
+        configure - config {
+            foreach {option value} $args { dict set ::headless::options($path) $option $value }
+        }
+        cget {
+            if {[dict exists $::headless::options($path) [lindex $args 0]]} { return [dict get $::headless::options($path) [lindex $args 0]] }
+        }
+    }
+    return ""
+}
+proc headless::font_size {font} {
+    set size [lindex $font 1]
+    if {![string is integer -strict $size]} { set size 12 }
+    return [expr {abs($size)}]
+}
+foreach class {frame label canvas button toplevel} { interp alias {} ::$class {} headless::create }
+foreach command {place grid pack bind wm event focus PyImagingPhoto} { proc ::$command args {} }
+proc winfo {command args} {
+    set path [lindex $args 0]
+    switch -- $command {
+        children {
+            set prefix [expr {$path eq "." ? "." : "$path."}]
+            set children {}
+            foreach child [lsort [array names ::headless::options]] {
+                set rest [string range $child [string length $prefix] end]
+                if {$child ne "." && [string match "$prefix*" $child] && [string first . $rest] < 0} { lappend children $child }
+            }
+            return $children
+        }
+        exists { return [info exists ::headless::options($path)] }
+    }
+    return 0
+}
+proc destroy args {
+    foreach path $args {
+        foreach widget [array names ::headless::options] {
+            if {$widget eq $path || [string match "$path.*" $widget]} {
+                unset ::headless::options($widget)
+                catch {rename ::$widget ""}
+            }
+        }
+    }
+}
+proc image {command args} {
+    switch -- $command {
+        create {
+            set name [lindex $args 1]
+            set options [lrange $args 2 end]
+            if {$name eq "" || [string index $name 0] eq "-"} {
+                set name "image[incr ::headless::image_count]"
+                set options [lrange $args 1 end]
+            }
+            headless::create $name {*}$options
+            dict set ::headless::images $name 1
+            return $name
+        }
+        delete {
+            foreach name $args { destroy $name; dict unset ::headless::images $name }
+        }
+        names { return [dict keys $::headless::images] }
+    }
+    return 0
+}
+proc font {command args} {
+    switch -- $command {
+        create { return [lindex $args 0] }
+        measure { return [expr {int([string length [lindex $args end]] * [headless::font_size [lindex $args 0]] * 0.6)}] }
+        metrics { return [expr {int([headless::font_size [lindex $args 0]] * 1.2)}] }
+    }
+    return ""
+}
+headless::create .
+"""
+
+
+def create_headless_window() -> tkinter.Tk:
+    """
+    returns a window backed by a Tcl interpreter without Tk, so that no display is needed
+    widgets can be constructed, configured and placed in it like in a real window, but nothing is drawn
+    """
+    window = tkinter.Tcl()
+    window.tk.eval(headless_tk_script)
+    # like the first real window, the window is the default master of images created without one
+    if tkinter._default_root is None:
+        tkinter._default_root = window
+    return window
+
+
+class HeadlessWindowLayoutManager(LayoutManager):
+    """LayoutManager whose window is a headless window, used to run the widgets of a SmartMirror without a display"""
+
+    def create_window(self) -> tkinter.Tk:
+        """see create_headless_window"""
+        return create_headless_window()
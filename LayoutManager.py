@@ -0,0 +1,236 @@
+from collections import OrderedDict, defaultdict
+import tkinter
+from Widgets.BaseWidget import BaseWidget
+from Widgets.Dimensions import Size, Conversion, Constraint
+from Widgets.FontRegistry import FontRegistry
+from Widgets.TclBatch import TclBatch
+
+
+class LayoutManager:
+    """
+    Class to manage the layout of individual widgets
+    Allows widgets to reference properties of other widgets to allow for dynamic sizing
+    """
+
+    #################
+    # Setup Methods #
+    #################
+
+    def __init__(self, parent, size: {str: tuple}, colors: {str: str}, fonts: {str: str}):
+        """
+        Initializes a layout manager object that manages the widgets of parents.widgets
+
+        :param parent: should be the SmartMirror object that has the property widgets
+        :param size: see LayoutManager.set_conversion
+        """
+        self.widgets: {str: BaseWidget} = parent.widgets
+        self.conversion: Conversion = None
+        self.physical_size, self.pixel_size = None, None
+        self.set_conversion(size)
+        self.colors = colors
+        self.fonts = fonts
+        self.window = self.create_window()
+        self.tcl_batch = TclBatch(self.window)
+        self.font_registry = FontRegistry(self.window, fonts)
+        self.configure_window()
+        self.constraints: OrderedDict = OrderedDict()
+        self.parked_widgets: {str} = set()
+
+    def set_conversion(self, size: {str: [str, str]}) -> None:
+        """
+        takes the dictionary and constructs two tuples for the different size variables, as well as a conversion object
+        for the layout manager to convert between different units of measurement
+
+        :param size: should be in the format {"pixel_size": (a, b), "physical_size": (c, d)}
+            where a, b, c, d are strings that can be converted into Size objects
+        """
+        self.pixel_size = Size.size_from_str(size["pixel_size"][0]), Size.size_from_str(size["pixel_size"][1])
+        self.physical_size = Size.size_from_str(size["physical_size"][0]), Size.size_from_str(size["physical_size"][1])
+        conversions = self.pixel_size[0]/self.physical_size[0], self.pixel_size[1]/self.physical_size[1]
+        assert conversions[0] == conversions[1], f"Ratio of pixel size to physical size is inconsistent along width and height\n\t{conversions[0]} and {conversions[1]} are not equal"
+        self.conversion: Conversion = conversions[0]
+
+    def create_window(self) -> tkinter.Tk:
+        """Creates the tkinter window that all the widgets are contained within"""
+        return tkinter.Tk()
+
+    def configure_window(self) -> None:
+        """Sets the default settings for the tkinter window"""
+        self.window.title = "MirrorGUI"
+        self.window.config(background=self.colors["background_color"])
+        self.window.geometry(f"{self.conversion.to_px(self.pixel_size[0])}x{self.conversion.to_px(self.pixel_size[1])}")
+        self.window.resizable(0, 0)
+
+    ##################
+    # Layout Methods #
+    ##################
+
+    def add_constraints(self, new_constraints: [Constraint]) -> [(str, str)]:
+        """adds each constraint and returns the identifiers of the added constraints"""
+        keys = []
+        for constraint in new_constraints:
+            assert constraint.get_identifier() not in self.constraints, f"Constraint {constraint.get_identifier()} was already added"
+            self.constraints[constraint.get_identifier()] = constraint
+            keys.append(constraint.get_identifier())
+        return keys
+
+    def add_str_constraints(self, new_constraints: [str]) -> [(str, str)]:
+        """
+        Constructs and adds a constraint for each string description in new_constraints
+        :param new_constraints: contains strings that follow the format necessary for Constraint.construct_constraint
+        :return: the identifiers of the added constraints
+        """
+        return self.add_constraints(map(lambda c: Constraint.construct_constraint(self, c), new_constraints))
+
+    def remove_constraints(self, keys: [(str, str)]) -> None:
+        """
+        removes the constraints with the given identifiers
+        the constrained property is reset so that it is derived from the widget's remaining constraints
+        """
+        for key in keys:
+            obj, prop = key
+            del self.constraints[key]
+            if obj in self.widgets:
+                self.widgets[obj].__setattr__(prop, None)
+
+    def get_affected_constraints(self, keys: [(str, str)]) -> [(str, str)]:
+        """
+        returns the identifiers of the constraints in keys and of every constraint that depends on them
+        either directly or through other constraints, in the order they were added
+        keys may contain identifiers of constraints that have been removed
+        """
+        affected = set(keys)
+        changed = True
+        while changed:
+            changed = False
+            for key, constraint in self.constraints.items():
+                if key not in affected and any(map(lambda dependent: dependent in affected, constraint.get_dependents())):
+                    affected.add(key)
+                    changed = True
+        return [key for key in self.constraints if key in affected]
+
+    def evaluate_constraints(self, keys: [(str, str)] = None) -> None:
+        """
+        evaluates each constraint's value and sets the corresponding object's property to that value
+        constraints are evaluated in the order they are added, with a constraint's dependent constraints
+        being evaluated before it
+
+        :param keys: if given, only these constraints are evaluated and all others are assumed to be up to date
+            (see LayoutManager.get_affected_constraints). If not, the constraints of every widget that is not parked
+            are evaluated, along with the constraints they depend on
+        """
+        if keys is None:
+            keys = [key for key in self.constraints if key[0] not in self.parked_widgets]
+            evaluated = defaultdict(lambda: False)
+        else:
+            evaluated = defaultdict(lambda: True, {key: False for key in keys})
+        for key in keys:
+            self.evaluate_constraint(key, evaluated)
+
+    def evaluate_constraint(self, key: (str, str), evaluated):
+        """evaluates an individual constraint and its dependent constraints
+        helper method of LayoutManager.evaluate_constraints"""
+        if not evaluated[key]:
+            for dependent_key in self.constraints[key].get_dependents():
+                if dependent_key in self.constraints and dependent_key != key: self.evaluate_constraint(dependent_key, evaluated)
+            (obj, prop), value = self.constraints[key].evaluate()
+            evaluated[key] = True
+            obj.__setattr__(prop, value)
+
+    def place_all(self) -> None:
+        """positions all the widgets that are not parked in the window based on their positions defined from the constraints"""
+        self.place_widgets(self.widgets.keys())
+
+    def place_widgets(self, widget_ids: [str]) -> None:
+        """
+        positions the widgets with the given ids based on their positions defined from the constraints, parked widgets stay hidden
+        the geometry commands of the widgets are applied together as one Tcl script, see TclBatch
+        """
+        with self.tcl_batch:
+            for widget_id in widget_ids:
+                if widget_id in self.parked_widgets:
+                    continue
+                widget = self.widgets[widget_id]
+                (x, y), (width, height) = widget.get_rect()
+                widget.place(x=x, y=y, width=width, height=height)
+
+    def set_colors(self, colors: {str: str}) -> None:
+        """
+        replaces the dictionary of colors
+        every tkinter widget in the window that uses one of the previous colors is reconfigured to the new color
+        """
+        replacements = {self.colors[key].lower(): colors[key] for key in self.colors if key in colors}
+        self.colors = colors
+        self.window.config(background=colors["background_color"])
+        children = self.window.winfo_children()
+        while children:
+            child = children.pop()
+            children.extend(child.winfo_children())
+            for option in ["background", "foreground"]:
+                try:
+                    value = str(child.cget(option)).lower()
+                except tkinter.TclError:
+                    continue
+                if value in replacements:
+                    child.config(**{option: replacements[value]})
+
+    def set_fonts(self, fonts: {str: str}) -> None:
+        """replaces the dictionary of fonts, and reconfigures the named fonts that the widgets display in place"""
+        self.fonts = fonts
+        self.font_registry.set_config(fonts)
+
+    ##################
+    # Helper Methods #
+    ##################
+
+    def get_window(self) -> tkinter.Tk:
+        """Return the window that all the widgets are contained within"""
+        return self.window
+
+    def get_tcl_batch(self) -> TclBatch:
+        """Return the TclBatch that applies the commands of the widgets in the window"""
+        return self.tcl_batch
+
+    def get_font_registry(self) -> FontRegistry:
+        """Return the FontRegistry of the named fonts that the widgets display"""
+        return self.font_registry
+
+    def get_colors(self) -> {str: str}:
+        """returns the dictionary of colors"""
+        return self.colors
+
+    def get_fonts(self) -> {}:
+        """returns the dictionary of colors"""
+        return self.fonts
+
+    def get_widget(self, widget_id: str) -> BaseWidget:
+        """
+        returns the widget associated with the widget_id so that its properties may be referenced
+
+        :param widget_id: must be a key in SmartMirror's widgets OrderedDict
+        :return: returns the widget associated with the widget id
+        """
+        return self.widgets[widget_id]
+
+    def to_px(self, size: Size) -> int:
+        """returns the int number of pixels the Size object represents in the given layout"""
+        return self.conversion.to_px(size)
+
+    def get_unused_id(self, widget) -> str:
+        """
+        generates an unused ID for a widget in the scenario an ID was not defined in the widget's props
+
+        :param widget: widget is the widget the ID will be assigned to
+        :return: returns an ID that should be unique to the widget
+        """
+        class_name = type(widget).__name__
+        i = 1
+        while True:
+            if f"{class_name}_[{i}]" not in self.widgets.keys():
+                return f"{class_name}_[{i}]"
+            else:
+                i += 1
+
+    def __str__(self) -> str:
+        """gives details about the LayoutManager's sizes, conversions and constraints"""
+        return f"\nLayoutManager Object:\n\tConversion = {self.conversion}\n\tPixel Size = {tuple(map(str, self.pixel_size))}\n\tPhysical Size = {tuple(map(str, self.physical_size))}\n\tConstraints=[\n\t\t"+",\n\t\t".join(map(lambda c: str(c), self.constraints))+"]"
@@ -0,0 +1,157 @@
+from collections import Counter, defaultdict, deque
+import glob
+import tracemalloc
+
+
+class MemoryProfiler:
+    """
+    Attributes the memory used by the SmartMirror to the widgets and components whose calls allocated it,
+    and warns about the ones whose memory keeps growing, which is how leaks show up long before the device runs out of memory
+
+    Memory is measured with tracemalloc as the live bytes that were allocated during a component's calls, sampled every
+    sample time, so memory that is freed later, even by another component, no longer counts. Each component's calls go
+    through a caller function whose code has the component's name as its filename, which marks the allocations made
+    during the calls in their tracebacks. Memory allocated by nested measured calls counts towards the nested call's owner
+    Tkinter images are counted as the images created while constructing a component's options that still exist
+    """
+    # kinds of calls that create tkinter images, see BaseWidget.set_options
+    image_kinds = ["constructed options"]
+    owner_prefix = "<memory owner "
+
+    def __init__(self, smart_mirror, profiler_config: {}):
+        """
+        Initializes a MemoryProfiler and starts tracing memory allocations
+
+        :param smart_mirror: should have the methods get_window and the property update_manager
+        :param profiler_config: the "memory profiler" section of the config with the optional keys
+            "sample time": time in milliseconds between samples of the memory of each component, defaults to a minute
+            "window": number of consecutive samples a component must grow in to be reported, defaults to 10
+            "min growth": number of bytes a component must grow by across the window to be reported, defaults to 64 KiB
+            "frames": number of frames of the traceback tracemalloc stores for each allocation, defaults to 32.
+                allocations whose traceback is cut off before the call of a component are not attributed to it,
+                and storing more frames makes every allocation slower
+        """
+        self.smart_mirror = smart_mirror
+        self.sample_time = profiler_config.get("sample time", 60000)
+        self.window = profiler_config.get("window", 10)
+        self.min_growth = profiler_config.get("min growth", 64 * 1024)
+        self.calls: {str: {str: int}} = defaultdict(lambda: defaultdict(int))
+        self.allocated: {str: int} = defaultdict(int)
+        self.callers: {str: callable} = {}
+        self.image_owners: {str: str} = {}
+        self.samples: {str: deque} = {}
+        self.total_samples: deque = deque(maxlen=self.window)
+        self.leaks: {str: {str: int}} = {}
+        # snapshot of the memory of each component at its last report, see MemoryProfiler.report_leak
+        self.snapshots: {str: tracemalloc.Snapshot} = {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(profiler_config.get("frames", 32))
+        # the memory of the components when the profiler started, which is none since no component was called yet
+        self.snapshot = MemoryProfiler.get_owner_snapshot(MemoryProfiler.take_snapshot(), "*")
+
+    def start(self) -> None:
+        """Samples the memory of each component every sample time while the SmartMirror is awake"""
+        self.smart_mirror.update_manager.add_update_checker(self.sample, self.sample_time)
+
+    @staticmethod
+    def get_name(owner) -> str:
+        """returns the name that owner's memory is reported under, widgets are named by their type and id"""
+        return f"{type(owner).__name__} {owner.get_id()}" if hasattr(owner, "get_id") else str(owner)
+
+    def get_image_names(self) -> {str}:
+        """returns the names of the tkinter images that exist"""
+        return set(map(str, self.smart_mirror.get_window().image_names()))
+
+    def get_caller(self, name: str):
+        """returns the function that calls the functions of the component with the given name, see MemoryProfiler"""
+        if name not in self.callers:
+            namespace = {}
+            exec(compile("def call(func, *args, **kargs):\n    return func(*args, **kargs)\n", f"{MemoryProfiler.owner_prefix}{name}>", "exec"), namespace)
+            self.callers[name] = namespace["call"]
+            self.allocated[name] = 0
+        return self.callers[name]
+
+    def wrap(self, owner, kind: str, func):
+        """returns a function that calls func and attributes the memory and images it allocates to owner"""
+        name = MemoryProfiler.get_name(owner)
+        caller = self.get_caller(name)
+
+        def measured(*args, **kargs):
+            self.calls[name][kind] += 1
+            if kind not in MemoryProfiler.image_kinds:
+                return caller(func, *args, **kargs)
+            images = self.get_image_names()
+            try:
+                return caller(func, *args, **kargs)
+            finally:
+                for image in self.get_image_names() - images:
+                    # images created by a nested measured call were already attributed to the nested call's owner
+                    self.image_owners.setdefault(image, name)
+        return measured
+
+    def get_live_memory(self, snapshot: tracemalloc.Snapshot) -> {str: int}:
+        """returns the live bytes of each component: the traced memory whose innermost component call is the component's"""
+        allocated = dict.fromkeys(self.callers, 0)
+        for statistic in snapshot.statistics("traceback"):
+            for frame in reversed(statistic.traceback):
+                if frame.filename.startswith(MemoryProfiler.owner_prefix):
+                    allocated[frame.filename[len(MemoryProfiler.owner_prefix):-1]] += statistic.size
+                    break
+        return allocated
+
+    def sample(self) -> None:
+        """records the memory and images of each component, and warns about the components that grew across the window"""
+        images = self.get_image_names()
+        self.image_owners = {image: name for image, name in self.image_owners.items() if image in images}
+        image_counts = Counter(self.image_owners.values())
+        self.total_samples.append(tracemalloc.get_traced_memory()[0])
+        self.allocated = self.get_live_memory(MemoryProfiler.take_snapshot())
+        for name, allocated in self.allocated.items():
+            samples = self.samples.setdefault(name, deque(maxlen=self.window))
+            samples.append((allocated, image_counts[name]))
+            if len(samples) == self.window and self.is_growing(samples):
+                self.report_leak(name, samples)
+                samples.clear()
+
+    def is_growing(self, samples: deque) -> bool:
+        """
+        returns True if the images grew in every sample, or if the memory grew in every sample by at least min growth overall
+        memory only counts as growing if the memory traced in total grew as well, since memory allocated by one component
+        can be freed by another one
+        """
+        memory, images = zip(*samples)
+        if all(a < b for a, b in zip(images, images[1:])):
+            return True
+        return all(a < b for a, b in zip(memory, memory[1:])) and memory[-1] - memory[0] >= self.min_growth \
+            and self.total_samples[-1] - self.total_samples[0] >= self.min_growth
+
+    def report_leak(self, name: str, samples: deque) -> None:
+        """prints the growth of the component and the lines of the component's calls that allocated the most memory since its last report"""
+        self.leaks[name] = {"bytes": samples[-1][0] - samples[0][0], "images": samples[-1][1] - samples[0][1]}
+        snapshot = MemoryProfiler.get_owner_snapshot(MemoryProfiler.take_snapshot(), name)
+        baseline = self.snapshots.get(name, self.snapshot)
+        top_lines = snapshot.compare_to(baseline, "lineno")[:5]
+        self.snapshots[name] = snapshot
+        print(f"Possible memory leak in {name}: grew by {self.leaks[name]['bytes']} bytes and {self.leaks[name]['images']} images "
+              f"over the last {self.window} samples\n\t" + "\n\t".join(map(str, top_lines)))
+
+    @staticmethod
+    def take_snapshot() -> tracemalloc.Snapshot:
+        """returns a snapshot of the traced memory without the memory used by tracemalloc itself"""
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    @staticmethod
+    def get_owner_snapshot(snapshot: tracemalloc.Snapshot, name: str) -> tracemalloc.Snapshot:
+        """returns the snapshot with only the memory allocated during the calls of the component with the given name, or of any component if name is *"""
+        pattern = "*" if name == "*" else glob.escape(name)
+        return snapshot.filter_traces([tracemalloc.Filter(True, f"{glob.escape(MemoryProfiler.owner_prefix)}{pattern}>", all_frames=True)])
+
+    def get_report(self) -> {str: {str: int}}:
+        """returns the calls, the allocated bytes, the existing images and the reported growth of every component"""
+        image_counts = Counter(self.image_owners.values())
+        return {name: dict(self.calls[name], bytes=self.allocated[name], images=image_counts[name], leak=self.leaks.get(name, None))
+                for name in self.allocated}
+
+    def __str__(self) -> str:
+        """gives the memory of each component"""
+        return "\n\t".join(["MemoryProfiler Components:"] + [f"{name}: {report}" for name, report in self.get_report().items()])
@@ -0,0 +1,118 @@
+import datetime
+from PowerManager import PowerManager
+from Widgets.BaseWidget import BaseWidget
+
+
+class PageManager:
+    """
+    Class used to show one page of widgets at a time, such as a morning page and an evening page
+    Widgets are put on a page by their "page" prop, subwidgets are on the page of their parent widget,
+    and widgets without a page are shown on every page
+    The widgets of the pages that are not shown are parked: they are hidden, excluded from the layout,
+    and their updates and subscriptions are paused, so inactive pages cost nothing
+
+    The page shown is (in order of priority):
+        1. the page of the last "page NAME" message received on the wake port (until a "rotate" message is received)
+        2. one of the pages whose hours contain the current time
+        3. one of the pages without hours
+    If more than one page can be shown, they take turns every rotate time
+    """
+
+    def __init__(self, smart_mirror, pages_config: {}):
+        """
+        Initializes a PageManager for smart_mirror based on pages_config
+
+        :param smart_mirror: should have the methods show_page, get_time and the properties widgets, update_manager
+        :param pages_config: see PageManager.set_config
+        """
+        self.smart_mirror = smart_mirror
+        self.active_page: str = None
+        self.shown_at: datetime.datetime = None
+        self.override: str = None
+        self.loop_method = None
+        self.rotate_time: int = None
+        self.hours: {str: [(datetime.time, datetime.time)]} = {}
+        self.check_time: int = None
+        self.set_config(pages_config)
+
+    def set_config(self, pages_config: {}) -> None:
+        """
+        :param pages_config: should be in the format
+            {"rotate time": ms, "hours": {"morning": [["06:30", "09:00"], ...], ...}, "check time": ms}
+            where every key is optional. hours may span midnight, such as ["22:00", "01:00"]
+        """
+        self.rotate_time = pages_config.get("rotate time", None)
+        self.hours = {page: [(PowerManager.parse_time(start), PowerManager.parse_time(end)) for start, end in hours]
+                      for page, hours in pages_config.get("hours", {}).items()}
+        self.check_time = pages_config.get("check time", 1000)
+        if self.loop_method is not None:
+            self.loop_method.time = self.check_time
+
+    def start(self) -> None:
+        """Begins checking which page should be shown. The checks are paused while the mirror is asleep"""
+        self.loop_method = self.smart_mirror.update_manager.add_update_checker(self.check, self.check_time)
+
+    #################
+    # Page Checking #
+    #################
+
+    def check(self) -> None:
+        """shows the page that should be shown if it is not shown yet"""
+        page = self.choose_page()
+        if page != self.active_page or self.shown_at is None:
+            self.active_page = page
+            self.shown_at = self.smart_mirror.get_time()
+            if page is not None:
+                print(f"Showing page {page} at {self.shown_at}")
+            self.smart_mirror.show_page(page)
+
+    def choose_page(self) -> str:
+        """returns the page that should be shown, or None if none of the pages should be shown"""
+        pages = self.get_pages()
+        if self.override is not None:
+            if self.override in pages:
+                return self.override
+            print(f"PageManager received the unknown page {self.override}, pages = {pages}")
+            self.override = None
+        now = self.smart_mirror.get_time()
+        candidates = [page for page in pages if page in self.hours and PowerManager.in_hours(self.hours[page], now.time())]
+        if not candidates:
+            candidates = [page for page in pages if page not in self.hours]
+        if not candidates:
+            return None
+        if self.active_page not in candidates:
+            return candidates[0]
+        if self.rotate_time is not None and now - self.shown_at >= datetime.timedelta(milliseconds=self.rotate_time):
+            return candidates[(candidates.index(self.active_page) + 1) % len(candidates)]
+        return self.active_page
+
+    ##################
+    # Helper Methods #
+    ##################
+
+    def get_pages(self) -> [str]:
+        """returns the pages of the widgets in the order they first appear"""
+        pages = []
+        for widget in self.smart_mirror.widgets.values():
+            page = PageManager.get_page(widget)
+            if page is not None and page not in pages:
+                pages.append(page)
+        return pages
+
+    @staticmethod
+    def get_page(widget: BaseWidget) -> str:
+        """returns the page the widget is on, or None if it is on every page"""
+        while widget is not None:
+            if "page" in widget.props:
+                return widget.props["page"]
+            widget = widget.parent_widget
+        return None
+
+    def is_parked(self, widget: BaseWidget) -> bool:
+        """returns True if the widget is on a page that is not shown. Widgets are not parked until a page was shown"""
+        page = PageManager.get_page(widget)
+        return self.shown_at is not None and page is not None and page != self.active_page
+
+    def __str__(self) -> str:
+        """gives details about the PageManager's state and schedule"""
+        return f"PageManager: active page = {self.active_page}, override = {self.override}, pages = {self.get_pages()}, rotate time = {self.rotate_time}, hours = {[(page, [(str(s), str(e)) for s, e in hours]) for page, hours in self.hours.items()]}"
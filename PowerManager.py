@@ -0,0 +1,161 @@
+import datetime
+import pathlib
+import socket
+
+
+class PowerManager:
+    """
+    Class used to put the SmartMirror to sleep when nobody is looking at it, and to wake it up again
+    While asleep, the widgets are hidden and none of the update checkers (updates, fetches, layout) are executed
+
+    The mirror is awake when (in order of priority):
+        1. a "wake" or "sleep" message was received on the wake port (until a "schedule" message is received)
+        2. the presence file exists, and was modified within the presence timeout if one is given
+        3. the current time is within one of the awake hours
+    If neither awake hours nor a presence file are configured, the mirror never sleeps
+    """
+
+    def __init__(self, smart_mirror, power_config: {}):
+        """
+        Initializes a PowerManager for smart_mirror based on power_config
+
+        :param smart_mirror: should have the methods sleep, wake, get_time and the properties update_manager, page_manager
+        :param power_config: see PowerManager.set_config
+        """
+        self.smart_mirror = smart_mirror
+        self.asleep = False
+        self.override = None
+        self.loop_method = None
+        self.socket = None
+        self.wake_port = None
+        self.awake_hours: [(datetime.time, datetime.time)] = []
+        self.presence_file: pathlib.Path = None
+        self.presence_timeout: int = None
+        self.check_time: int = None
+        self.set_config(power_config)
+
+    def set_config(self, power_config: {}) -> None:
+        """
+        :param power_config: should be in the format
+            {"awake hours": [["06:30", "09:00"], ...], "presence file": path, "presence timeout": ms,
+             "wake port": port, "check time": ms}
+            where every key is optional. awake hours may span midnight, such as ["22:00", "01:00"]
+        """
+        self.awake_hours = [(PowerManager.parse_time(start), PowerManager.parse_time(end)) for start, end in power_config.get("awake hours", [])]
+        presence_file = power_config.get("presence file", None)
+        self.presence_file = pathlib.Path(presence_file) if presence_file is not None else None
+        self.presence_timeout = power_config.get("presence timeout", None)
+        self.check_time = power_config.get("check time", 1000)
+        if self.loop_method is not None:
+            self.loop_method.time = self.check_time
+        wake_port = power_config.get("wake port", None)
+        if wake_port != self.wake_port:
+            self.open_socket(wake_port)
+
+    def start(self) -> None:
+        """Begins checking whether the mirror should be asleep. The checks continue while the mirror is asleep"""
+        self.loop_method = self.smart_mirror.update_manager.add_persistent_update_checker(self.check, self.check_time)
+
+    ##################
+    # Power Checking #
+    ##################
+
+    def check(self) -> None:
+        """puts the mirror to sleep or wakes it up if its state should change"""
+        self.read_messages()
+        awake = self.should_be_awake()
+        if awake and self.asleep:
+            self.asleep = False
+            print(f"Mirror waking up at {self.smart_mirror.get_time()}")
+            self.smart_mirror.wake()
+        elif not awake and not self.asleep:
+            self.asleep = True
+            print(f"Mirror going to sleep at {self.smart_mirror.get_time()}")
+            self.smart_mirror.sleep()
+
+    def should_be_awake(self) -> bool:
+        """returns True if the mirror should currently be awake"""
+        if self.override is not None:
+            return self.override
+        if self.presence_file is not None and self.is_present():
+            return True
+        if self.awake_hours:
+            return self.in_awake_hours(self.smart_mirror.get_time().time())
+        return self.presence_file is None
+
+    def is_present(self) -> bool:
+        """returns True if the presence file exists and was modified within the presence timeout"""
+        try:
+            modified = self.presence_file.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return self.presence_timeout is None or (self.smart_mirror.get_time().timestamp() - modified) * 1000 < self.presence_timeout
+
+    def in_awake_hours(self, now: datetime.time) -> bool:
+        """returns True if now is within any of the awake hours"""
+        return PowerManager.in_hours(self.awake_hours, now)
+
+    @staticmethod
+    def in_hours(hours: [(datetime.time, datetime.time)], now: datetime.time) -> bool:
+        """returns True if now is within any of the (start, end) ranges of hours, which may span midnight"""
+        for start, end in hours:
+            if start <= end and start <= now < end:
+                return True
+            if start > end and (now >= start or now < end):
+                return True
+        return False
+
+    ####################
+    # External Trigger #
+    ####################
+
+    def open_socket(self, wake_port: int) -> None:
+        """listens for messages on the local UDP port wake_port, or stops listening if wake_port is None"""
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        self.wake_port = wake_port
+        if wake_port is not None:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.bind(("127.0.0.1", wake_port))
+            self.socket.setblocking(False)
+
+    def read_messages(self) -> None:
+        """
+        reads all the messages received since the last check, the last valid message decides the override
+        the messages "page NAME" and "rotate" are passed on to the PageManager, see PageManager.override
+        """
+        if self.socket is None:
+            return
+        while True:
+            try:
+                message = self.socket.recv(64).decode(encoding="utf-8", errors="replace").strip()
+            except BlockingIOError:
+                return
+            if message.lower().startswith("page "):
+                self.smart_mirror.page_manager.override = message[len("page "):].strip()
+                continue
+            message = message.lower()
+            if message == "wake":
+                self.override = True
+            elif message == "sleep":
+                self.override = False
+            elif message == "schedule":
+                self.override = None
+            elif message == "rotate":
+                self.smart_mirror.page_manager.override = None
+            else:
+                print(f"PowerManager received an unknown message: {message}")
+
+    ##################
+    # Helper Methods #
+    ##################
+
+    @staticmethod
+    def parse_time(time_str: str) -> datetime.time:
+        """returns the time that the string in the format HH:MM represents"""
+        return datetime.datetime.strptime(time_str, "%H:%M").time()
+
+    def __str__(self) -> str:
+        """gives details about the PowerManager's state and triggers"""
+        return f"PowerManager: asleep = {self.asleep}, override = {self.override}, awake hours = {[(str(s), str(e)) for s, e in self.awake_hours]}, presence file = {self.presence_file}, wake port = {self.wake_port}"
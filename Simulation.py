@@ -0,0 +1,180 @@
+"""
+Simulates the operation of the SmartMirror in virtual time, such that a day of operation can be replayed in seconds
+Data sources are simulated instead of fetched, and the number of calls and the CPU time of each widget are reported
+
+Usage: python Simulation.py [--config config/config.json] [--hours 24] [--start 2020-01-01T00:00:00]
+                            [--location-refresh 200] [--fetch] [--display] [--json]
+"""
+from collections import defaultdict
+import argparse
+import datetime
+import heapq
+import itertools
+import json
+import pathlib
+import time
+from HeadlessLayout import HeadlessWindowLayoutManager
+from LayoutManager import LayoutManager
+from SmartMirror import SmartMirror
+from Widgets.BaseWidget import BaseWidget
+
+
+class VirtualClock:
+    """
+    Clock whose time only advances when it is run
+    Has the scheduling methods of a tkinter window so that it can replace the window's real time in the SmartMirror
+    """
+
+    def __init__(self, start: datetime.datetime):
+        """creates a clock at the time start with no scheduled calls"""
+        self.start = start
+        self.time = 0   # milliseconds since start
+        self.scheduled: [(int, int, str)] = []
+        self.callbacks: {str: (callable, tuple)} = {}
+        self.order = itertools.count()
+        self.call_count = 0
+
+    def after(self, ms: int, func, *args) -> str:
+        """schedules func to be called with args after ms milliseconds, returns an id that can be cancelled"""
+        order = next(self.order)
+        after_id = f"after#{order}"
+        heapq.heappush(self.scheduled, (self.time + ms, order, after_id))
+        self.callbacks[after_id] = (func, args)
+        return after_id
+
+    def after_idle(self, func, *args) -> str:
+        """schedules func to be called after all the calls that are due at the current time"""
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id: str) -> None:
+        """cancels the scheduled call with the given id"""
+        self.callbacks.pop(after_id, None)
+
+    def now(self) -> datetime.datetime:
+        """returns the virtual time"""
+        return self.start + datetime.timedelta(milliseconds=self.time)
+
+    def run(self, duration: int) -> None:
+        """makes all the scheduled calls that are due in the next duration milliseconds in the order they are due"""
+        end = self.time + duration
+        while self.scheduled and self.scheduled[0][0] <= end:
+            due, order, after_id = heapq.heappop(self.scheduled)
+            if after_id not in self.callbacks:
+                continue
+            func, args = self.callbacks.pop(after_id)
+            self.time = due
+            self.call_count += 1
+            func(*args)
+        self.time = end
+
+
+class CallStats:
+    """
+    Keeps track of the number of calls and the CPU time of functions, grouped by the object they belong to
+    CPU time is exclusive: time spent in a nested measured function only counts towards the nested function's owner
+    """
+
+    def __init__(self):
+        self.calls: {object: {str: int}} = defaultdict(lambda: defaultdict(int))
+        self.cpu: {object: float} = defaultdict(float)
+        self.nested_cpu: [float] = []
+
+    def wrap(self, owner, kind: str, func):
+        """returns a function that calls func and counts the call as a call of the given kind made by owner"""
+        def measured(*args, **kargs):
+            self.nested_cpu.append(0.0)
+            start = time.process_time()
+            try:
+                return func(*args, **kargs)
+            finally:
+                elapsed = time.process_time() - start
+                self.cpu[owner] += elapsed - self.nested_cpu.pop()
+                if self.nested_cpu:
+                    self.nested_cpu[-1] += elapsed
+                self.calls[owner][kind] += 1
+        return measured
+
+    def get_report(self) -> {str: {str: float}}:
+        """returns the number of calls of each kind and the CPU time in seconds of every owner"""
+        def get_name(owner) -> str:
+            return f"{type(owner).__name__} {owner.get_id()}" if isinstance(owner, BaseWidget) else str(owner)
+        return {get_name(owner): dict(self.calls[owner], cpu=round(self.cpu[owner], 6)) for owner in self.calls}
+
+
+class SimulatedSmartMirror(SmartMirror):
+    """
+    SmartMirror that runs in the virtual time of a VirtualClock with simulated data sources,
+    and measures the calls of its components
+    Unless a display is used, the widgets are in a headless window (see create_headless_window), so no display is needed
+    and the time Tk would spend drawing is not measured
+    """
+
+    def __init__(self, json_path: pathlib.Path, clock: VirtualClock, simulate_sources: bool = True, display: bool = False):
+        self.stats = CallStats()
+        self.display = display
+        SmartMirror.__init__(self, json_path, clock, instruments=[self.stats], simulate_sources=simulate_sources)
+        self.get_window().withdraw()
+
+    def create_layout_manager(self) -> LayoutManager:
+        """creates a real window if the display is used, otherwise a headless window"""
+        if self.display:
+            return SmartMirror.create_layout_manager(self)
+        return HeadlessWindowLayoutManager(self, self.config["window_config"], self.config["colors"], self.config["fonts"])
+
+
+def simulate(json_path: pathlib.Path, hours: float, start: datetime.datetime, simulate_sources: bool = True, display: bool = False) -> {}:
+    """
+    simulates the SmartMirror defined by the config at json_path for the given number of hours and returns a report
+
+    :param simulate_sources: if False, the sources are fetched, which is reproducible if the config replays a network archive
+    :param display: if True, the widgets are in a real (hidden) window, which needs a display
+    """
+    clock = VirtualClock(start)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    smart_mirror = SimulatedSmartMirror(json_path, clock, simulate_sources, display)
+    smart_mirror.start()
+    clock.run(int(hours * 60 * 60 * 1000))
+    return {
+        "simulated hours": hours,
+        "wall seconds": round(time.perf_counter() - wall_start, 3),
+        "cpu seconds": round(time.process_time() - cpu_start, 3),
+        "scheduled calls": clock.call_count,
+        "applied options": smart_mirror.render_queue.applied_count,
+        "skipped options": smart_mirror.render_queue.skipped_count,
+        "components": smart_mirror.stats.get_report(),
+        "memory": smart_mirror.memory_profiler.get_report() if smart_mirror.memory_profiler is not None else None,
+    }
+
+
+def format_report(report: {}) -> str:
+    """formats the report returned by simulate as a table"""
+    components = report["components"]
+    kinds = sorted({kind for calls in components.values() for kind in calls if kind != "cpu"})
+    width = max(map(len, list(components) + ["component"]))
+    lines = [f"{key}: {value}" for key, value in report.items() if key not in ["components", "memory"]]
+    lines.append(" | ".join(["component".ljust(width)] + kinds + ["cpu"]))
+    for name, calls in sorted(components.items(), key=lambda t: -t[1]["cpu"]):
+        lines.append(" | ".join([name.ljust(width)] + [str(calls.get(kind, 0)).rjust(len(kind)) for kind in kinds] + [f"{calls['cpu']:.3f}"]))
+    if report["memory"] is not None:
+        lines.append(" | ".join(["component".ljust(width), "bytes", "images", "leak"]))
+        for name, memory in sorted(report["memory"].items(), key=lambda t: -t[1]["bytes"]):
+            lines.append(" | ".join([name.ljust(width), str(memory["bytes"]).rjust(5), str(memory["images"]).rjust(6), str(memory["leak"])]))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulates the SmartMirror in virtual time and reports call counts and CPU time")
+    parser.add_argument("--config", type=pathlib.Path, default=pathlib.Path("config/config.json"))
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--start", type=datetime.datetime.fromisoformat, default=datetime.datetime(2020, 1, 1))
+    parser.add_argument("--location-refresh", type=int, default=SmartMirror.WIDGET_LOCATION_REFRESH,
+                        help="overrides SmartMirror.WIDGET_LOCATION_REFRESH (ms)")
+    parser.add_argument("--fetch", action="store_true", help="fetches the data sources instead of simulating them, "
+                                                             "such as from a network archive in replay mode")
+    parser.add_argument("--display", action="store_true", help="puts the widgets in a real window, which needs a display, "
+                                                               "so that the time Tk spends is measured as well")
+    parser.add_argument("--json", action="store_true", help="prints the report as json")
+    args = parser.parse_args()
+    SmartMirror.WIDGET_LOCATION_REFRESH = args.location_refresh
+    simulation_report = simulate(args.config, args.hours, args.start, not args.fetch, args.display)
+    print(json.dumps(simulation_report, indent=2) if args.json else format_report(simulation_report))
@@ -1,168 +1,94 @@
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict
+import inspect
 import tkinter
 import pathlib
+import datetime
 from Widgets.BaseWidget import BaseWidget
 from Widgets import WidgetConstructor
-from Widgets.Dimensions import Size, Conversion, Constraint
+from Widgets.Dimensions import Constraint
+from Widgets.DataSources import DataSource
+from Widgets.RenderQueue import RenderQueue
+from Widgets.AsyncLoop import AsyncLoop
+from Widgets.NetworkArchive import NetworkArchive
+from ConfigWatcher import ConfigWatcher, ConfigDiff
+from ValidateConfigs import ConfigValidator
+from PowerManager import PowerManager
+from PageManager import PageManager
+from MemoryProfiler import MemoryProfiler
+from LayoutManager import LayoutManager
 
 
-class LayoutManager:
+class LoopMethod:
     """
-    Class to manage the layout of individual widgets
-    Allows widgets to reference properties of other widgets to allow for dynamic sizing
+    decorator used by update manager to schedule repeated function calls in a tkinter window
+    if the function is an async def, its coroutines are run on the async_loop, see AsyncLoop
     """
-
-    #################
-    # Setup Methods #
-    #################
-
-    def __init__(self, parent, size: {str: tuple}, colors: {str: str}, fonts: {str: str}):
-        """
-        Initializes a layout manager object that manages the widgets of parents.widgets
-
-        :param parent: should be the SmartMirror object that has the property widgets
-        :param size: see LayoutManager.set_conversion
-        """
-        self.widgets: {str: BaseWidget} = parent.widgets
-        self.conversion: Conversion = None
-        self.physical_size, self.pixel_size = None, None
-        self.set_conversion(size)
-        self.colors = colors
-        self.fonts = fonts
-        self.window = tkinter.Tk()
-        self.configure_window()
-        self.constraints: OrderedDict = OrderedDict()
-
-    def set_conversion(self, size: {str: [str, str]}) -> None:
-        """
-        takes the dictionary and constructs two tuples for the different size variables, as well as a conversion object
-        for the layout manager to convert between different units of measurement
-
-        :param size: should be in the format {"pixel_size": (a, b), "physical_size": (c, d)}
-            where a, b, c, d are strings that can be converted into Size objects
-        """
-        self.pixel_size = Size.size_from_str(size["pixel_size"][0]), Size.size_from_str(size["pixel_size"][1])
-        self.physical_size = Size.size_from_str(size["physical_size"][0]), Size.size_from_str(size["physical_size"][1])
-        conversions = self.pixel_size[0]/self.physical_size[0], self.pixel_size[1]/self.physical_size[1]
-        assert conversions[0] == conversions[1], f"Ratio of pixel size to physical size is inconsistent along width and height\n\t{conversions[0]} and {conversions[1]} are not equal"
-        self.conversion: Conversion = conversions[0]
-
-    def configure_window(self) -> None:
-        """Sets the default settings for the tkinter window"""
-        self.window.title = "MirrorGUI"
-        self.window.config(background=self.colors["background_color"])
-        self.window.geometry(f"{self.conversion.to_px(self.pixel_size[0])}x{self.conversion.to_px(self.pixel_size[1])}")
-        self.window.resizable(0, 0)
-
-    ##################
-    # Layout Methods #
-    ##################
-
-    def add_constraints(self, new_constraints: [Constraint]) -> None:
-        for constraint in new_constraints:
-            assert constraint.get_identifier() not in self.constraints
-            self.constraints[constraint.get_identifier()] = constraint
-
-    def add_str_constraints(self, new_constraints: [str]) -> None:
-        """
-        Constructs and adds a constraint for each string description in new_constraints
-        :param new_constraints: contains strings that follow the format necessary for Constraint.construct_constraint
-        """
-        self.add_constraints(map(lambda c: Constraint.construct_constraint(self, c), new_constraints))
-
-    def evaluate_constraints(self) -> None:
-        """
-        evaluates each constraint's value and sets the corresponding object's property to that value
-        constraints are evaluated in the order they are added, with a constraint's dependent constraints
-        being evaluated before it
-        """
-        evaluated = defaultdict(lambda: False)
-        for key in self.constraints:
-           self.evaluate_constraint(key, evaluated)
-
-    def evaluate_constraint(self, key: (str, str), evaluated):
-        """evaluates an individual constraint and its dependent constraints
-        helper method of LayoutManager.evaluate_constraints"""
-        if not evaluated[key]:
-            for dependent_key in self.constraints[key].get_dependents():
-                if dependent_key in self.constraints: self.evaluate_constraint(dependent_key, evaluated)
-            (obj, prop), value = self.constraints[key].evaluate()
-            evaluated[key] = True
-            obj.__setattr__(prop, value)
-
-    def place_all(self) -> None:
-        """positions all the widgets in the window based on their positions defined from the constraints"""
-        for widget_id, widget in self.widgets.items():
-            (x, y), (width, height) = widget.get_rect()
-            widget.place(x=x, y=y, width=width, height=height)
-
-    ##################
-    # Helper Methods #
-    ##################
-
-    def get_window(self) -> tkinter.Tk:
-        """Return the window that all the widgets are contained within"""
-        return self.window
-
-    def get_colors(self) -> {str: str}:
-        """returns the dictionary of colors"""
-        return self.colors
-
-    def get_fonts(self) -> {}:
-        """returns the dictionary of colors"""
-        return self.fonts
-
-    def get_widget(self, widget_id: str) -> BaseWidget:
-        """
-        returns the widget associated with the widget_id so that its properties may be referenced
-
-        :param widget_id: must be a key in SmartMirror's widgets OrderedDict
-        :return: returns the widget associated with the widget id
-        """
-        return self.widgets[widget_id]
-
-    def to_px(self, size: Size) -> int:
-        """returns the int number of pixels the Size object represents in the given layout"""
-        return self.conversion.to_px(size)
-
-    def get_unused_id(self, widget) -> str:
-        """
-        generates an unused ID for a widget in the scenario an ID was not defined in the widget's props
-
-        :param widget: widget is the widget the ID will be assigned to
-        :return: returns an ID that should be unique to the widget
-        """
-        class_name = type(widget).__name__
-        i = 1
-        while True:
-            if f"{class_name}_[{i}]" not in self.widgets.keys():
-                return f"{class_name}_[{i}]"
-            else:
-                i += 1
-
-    def __str__(self) -> str:
-        """gives details about the LayoutManager's sizes, conversions and constraints"""
-        return f"\nLayoutManager Object:\n\tConversion = {self.conversion}\n\tPixel Size = {tuple(map(str, self.pixel_size))}\n\tPhysical Size = {tuple(map(str, self.physical_size))}\n\tConstraints=[\n\t\t"+",\n\t\t".join(map(lambda c: str(c), self.constraints))+"]"
-
-
-class LoopMethod:
-    """decorator used by update manager to schedule repeated function calls in a tkinter window"""
-    def __init__(self, func, window, update_milliseconds: int, *args, **kargs):
+    def __init__(self, func, window, update_milliseconds: int, *args, async_loop: AsyncLoop = None, **kargs):
         self.window = window
         self.time = update_milliseconds
         self.func = func
         self.next_args = args
         self.next_kargs = kargs
+        self.async_loop = async_loop
+        self.after_id = None
+        self.cancelled = False
+        self.paused = False
 
     def __call__(self):
         """
         calls the function itself, and then schedules the same function call afterwards
         when the function is first called, it should return the args and kargs of the next method call
+        a coroutine returned by the function is run on the async loop, which cancels the coroutine of the previous call
+        if it has not finished, and the coroutine's return value becomes the args and kargs of the next method call
         """
-        returned_value = self.func(*self.next_args, **self.next_kargs)
+        try:
+            returned_value = self.func(*self.next_args, **self.next_kargs)
+            if inspect.iscoroutine(returned_value):
+                assert self.async_loop is not None, f"LoopMethod of {self.func} has no AsyncLoop to run its coroutines"
+                self.async_loop.run(self, returned_value, self.set_next_arguments)
+            else:
+                self.set_next_arguments(returned_value)
+        finally:
+            # the next call is scheduled even if the function raised, so one failure does not stop it for good
+            if not self.cancelled and not self.paused:
+                self.after_id = self.window.after(self.time, self.__call__)
+
+    def set_next_arguments(self, returned_value) -> None:
+        """sets the args and kargs of the next method call to the ones returned by the function, if it returned any"""
         if returned_value is not None:
-            self.next_kargs, self.next_kargs = returned_value
-        self.window.after(self.time, self.__call__)
+            self.next_args, self.next_kargs = returned_value
+
+    def cancel(self) -> None:
+        """stops the function from being called again, and cancels its coroutine if it has not finished"""
+        self.cancelled = True
+        self.cancel_scheduled_call()
+        if self.async_loop is not None:
+            self.async_loop.cancel(self)
+
+    def pause(self) -> None:
+        """stops the function from being called until it is resumed, and cancels its coroutine if it has not finished"""
+        self.paused = True
+        self.cancel_scheduled_call()
+        if self.async_loop is not None:
+            self.async_loop.cancel(self)
+
+    def resume(self) -> None:
+        """
+        calls the function immediately if it was paused, and continues calling it afterwards
+        if the function raises, the exception is printed, so that the loop methods resumed after this one still resume
+        """
+        if self.paused and not self.cancelled:
+            self.paused = False
+            try:
+                self()
+            except Exception as e:
+                print(f"LoopMethod of {self.func} failed when resumed:\n\t{type(e).__name__}: {e}")
+
+    def cancel_scheduled_call(self) -> None:
+        """cancels the next scheduled call of the function"""
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
 
 
 class UpdateManager:
@@ -172,9 +98,14 @@ class UpdateManager:
         """
         Initializes an UpdateManager used to keep track of the widgets in smart_mirror.widgets
 
-        :param smart_mirror: smart_mirror has a property widgets that has a method get_window that returns the root tk
+        :param smart_mirror: smart_mirror has a method get_scheduler that returns the object used to schedule calls,
+            and a method get_async_loop that returns the AsyncLoop that runs the coroutines of async update_values
         """
         self.smart_mirror = smart_mirror
+        self.widget_updaters: {str: LoopMethod} = {}
+        self.loop_methods: [LoopMethod] = []
+        self.parked_widgets: {str} = set()
+        self.paused = False
 
     def add_update_checkers(self, funcs, times, *args, **kwargs) -> None:
         """
@@ -184,17 +115,191 @@ class UpdateManager:
         for func, time in zip(funcs, times):
             self.add_update_checker(func, time, *args, **kwargs)
 
-    def add_update_checker(self, func, time, *args, **kwargs) -> None:
+    def add_update_checker(self, func, time, *args, **kwargs) -> LoopMethod:
         """
         Adds an update checker for the given func that executes every time (in ms)
         func would be called with the given args and kwargs
         """
-        LoopMethod(func, self.smart_mirror.get_window(), time)(*args, **kwargs)
+        loop_method = LoopMethod(func, self.smart_mirror.get_scheduler(), time, *args, async_loop=self.smart_mirror.get_async_loop(), **kwargs)
+        self.loop_methods.append(loop_method)
+        if self.paused:
+            # the first call is made when the UpdateManager is resumed
+            loop_method.paused = True
+        else:
+            loop_method()
+        return loop_method
+
+    def add_persistent_update_checker(self, func, time) -> LoopMethod:
+        """Adds an update checker like add_update_checker that keeps executing while the UpdateManager is paused"""
+        loop_method = LoopMethod(func, self.smart_mirror.get_scheduler(), time)
+        loop_method()
+        return loop_method
+
+    def pause(self) -> None:
+        """Stops all the update checkers until the UpdateManager is resumed"""
+        self.paused = True
+        self.loop_methods = [loop_method for loop_method in self.loop_methods if not loop_method.cancelled]
+        for loop_method in self.loop_methods:
+            loop_method.pause()
+
+    def resume(self) -> None:
+        """
+        Calls each paused update checker once in the order they were added, and continues executing them afterwards
+        The updaters of parked widgets stay paused
+        """
+        self.paused = False
+        self.loop_methods = [loop_method for loop_method in self.loop_methods if not loop_method.cancelled]
+        parked_loop_methods = [self.widget_updaters[widget_id] for widget_id in self.parked_widgets if widget_id in self.widget_updaters]
+        for loop_method in list(self.loop_methods):
+            if loop_method not in parked_loop_methods:
+                loop_method.resume()
 
     def add_widget_updater(self, widget, update_time=None) -> None:
         """Specific case of add_update_checker that registers the widget's update_values function"""
         if update_time is not None:
-            self.add_update_checker(widget.update_values, update_time)
+            self.widget_updaters[widget.get_id()] = self.add_update_checker(widget.update_values, update_time)
+
+    def remove_widget_updater(self, widget_id: str) -> None:
+        """Stops the updates of the widget with the given id if it has been registered"""
+        self.parked_widgets.discard(widget_id)
+        if widget_id in self.widget_updaters:
+            self.widget_updaters.pop(widget_id).cancel()
+
+    def park_widget_updater(self, widget_id: str) -> None:
+        """Pauses the updates of the widget with the given id until it is unparked, while the other update checkers keep executing"""
+        self.parked_widgets.add(widget_id)
+        if widget_id in self.widget_updaters:
+            self.widget_updaters[widget_id].pause()
+
+    def unpark_widget_updater(self, widget_id: str) -> None:
+        """Updates the widget with the given id immediately and continues its updates, unless the UpdateManager is paused"""
+        self.parked_widgets.discard(widget_id)
+        if widget_id in self.widget_updaters and not self.paused:
+            self.widget_updaters[widget_id].resume()
+
+
+class DataSourceManager:
+    """
+    Class used to keep track of the data sources that widgets subscribe to
+    Each distinct source is fetched once at the shortest update time of its subscribers,
+    and the data is passed to all of them
+    """
+
+    def __init__(self, smart_mirror):
+        """
+        Initializes a DataSourceManager with no sources
+
+        :param smart_mirror: smart_mirror has a property update_manager used to schedule the fetches of the sources
+        """
+        self.smart_mirror = smart_mirror
+        self.sources: {tuple: DataSource} = {}
+        self.source_updaters: {tuple: LoopMethod} = {}
+        self.refreshes: {tuple} = set()
+        self.caches: {type: {}} = {}
+
+    def subscribe(self, source: DataSource, callback, update_time: int = None) -> DataSource:
+        """
+        Subscribes callback to the source so that it is called with the source's data every time it is fetched
+        If an equal source already exists, callback is subscribed to the existing source and is immediately
+        called with its latest data. If the existing source has to fetch data for callback (see DataSource.join),
+        it is fetched again once the window is idle
+
+        :param update_time: time in milliseconds between updates that the subscriber needs
+        :return: the source that callback was subscribed to
+        """
+        key = source.get_key()
+        if key not in self.sources:
+            self.add_source(source)
+        if self.sources[key].join(source, callback) and self.sources[key] is not source:
+            self.refresh(self.sources[key])
+        source = self.sources[key]
+        source.add_subscriber(callback, update_time)
+        if source.data is not None:
+            callback(source.data)
+        self.schedule(source)
+        return source
+
+    def add_source(self, source: DataSource) -> None:
+        """
+        Adds a source that no equal source was added for
+        Its fetches are simulated if the SmartMirror simulates its sources, its requests go through the SmartMirror's
+        network archive if it has one, and its fetches are measured by the SmartMirror's instruments
+        Sources of the same type share a cache, which keeps their data after the sources are removed
+        """
+        source.network_archive = self.smart_mirror.network_archive
+        source.cache = self.caches.setdefault(type(source), {})
+        if self.smart_mirror.simulate_sources:
+            source.fetch = lambda: source.simulate(self.smart_mirror.get_time())
+        source.fetch = self.smart_mirror.instrument(f"Source {source.get_key()}", "fetches", source.fetch)
+        self.sources[source.get_key()] = source
+
+    def refresh(self, source: DataSource) -> None:
+        """
+        Fetches the source once the window is idle
+        Refreshes requested by several subscribers before then, such as widgets constructed together, are fetched once
+        """
+        key = source.get_key()
+        if key in self.refreshes:
+            return
+        self.refreshes.add(key)
+
+        def refresh():
+            self.refreshes.discard(key)
+            if self.sources.get(key, None) is source:
+                source.update()
+        self.smart_mirror.get_scheduler().after_idle(refresh)
+
+    def unsubscribe(self, source: DataSource, callback) -> None:
+        """Unsubscribes callback from the source. Sources without subscribers are no longer fetched"""
+        key = source.get_key()
+        source.remove_subscriber(callback)
+        if not source.subscribers:
+            del self.sources[key]
+            if key in self.source_updaters:
+                self.source_updaters.pop(key).cancel()
+        else:
+            self.schedule(source)
+
+    def pause(self, source: DataSource, callback) -> None:
+        """Stops calling callback until it is resumed. Sources whose subscribers are all paused are no longer fetched"""
+        source.pause_subscriber(callback)
+        self.schedule(source)
+
+    def resume(self, source: DataSource, callback) -> None:
+        """
+        Calls callback with the source's data and continues calling it every time the source is fetched
+        The source is fetched immediately if it was not fetched while callback was paused, and once the window is idle
+        if its data is missing the data of callback (see DataSource.resume_subscriber)
+        """
+        refetch = source.resume_subscriber(callback)
+        if source.get_key() not in self.source_updaters and source.get_update_time() is not None:
+            self.schedule(source)
+            return
+        if source.data is not None:
+            callback(source.data)
+        if refetch:
+            self.refresh(source)
+
+    def schedule(self, source: DataSource) -> None:
+        """
+        Makes sure the source is fetched at the shortest update time its subscribers need
+        Sources are fetched immediately when they have no data
+        """
+        key = source.get_key()
+        update_time = source.get_update_time()
+        if key in self.source_updaters:
+            if update_time is None:
+                self.source_updaters.pop(key).cancel()
+            else:
+                self.source_updaters[key].time = update_time
+        elif update_time is not None:
+            self.source_updaters[key] = self.smart_mirror.update_manager.add_update_checker(source.update, update_time)
+        elif source.data is None:
+            source.update()
+
+    def __str__(self) -> str:
+        """gives details about each source"""
+        return "\n\t".join(["DataSourceManager Sources:"] + list(map(str, self.sources.values())))
 
 
 class SmartMirror:
@@ -206,31 +311,119 @@ class SmartMirror:
 
     # this value is in milliseconds; it determines how often constraints should be reevaluated
     WIDGET_LOCATION_REFRESH = 200
+    # this value is in milliseconds; it determines how often the config file is checked for changes
+    CONFIG_REFRESH = 2000
 
     #################
     # Setup Methods #
     #################
 
-    def __init__(self, json_path: pathlib.Path):
+    def __init__(self, json_path: pathlib.Path, clock=None, instruments: [] = (), simulate_sources: bool = False):
         """
         Initializes the SmartMirror and all its sub-components based on the config in the json file at the given path
 
         :param json_path: points to a json that is formatted correctly
+        :param clock: if given, replaces the real time of the tkinter window. It must have the methods
+            after, after_idle, after_cancel (see tkinter.Misc) and now (see datetime.datetime.now)
+        :param instruments: objects that measure the calls of the widgets and components, see SmartMirror.instrument
+        :param simulate_sources: if True, data sources are simulated at the time of the clock instead of being fetched
         """
-        config = SmartMirror.parse_json(json_path)
+        self.clock = clock
+        self.instruments = list(instruments)
+        self.simulate_sources = simulate_sources
+        self.config = self.parse_json(json_path)
+        self.config_watcher: ConfigWatcher = ConfigWatcher(self, json_path)
         self.widgets: {str: BaseWidget} = OrderedDict()
-        self.layout_manager: LayoutManager = LayoutManager(self, config["window_config"], config["colors"], config["fonts"])
+        self.widget_keys: {str: str} = {}
+        self.widget_constraints: {str: [(str, str)]} = {}
+        self.layout_manager: LayoutManager = self.create_layout_manager()
+        self.memory_profiler: MemoryProfiler = None
+        if "memory profiler" in self.config:
+            self.memory_profiler = MemoryProfiler(self, self.config["memory profiler"])
+            self.instruments.append(self.memory_profiler)
+        self.render_queue: RenderQueue = RenderQueue(self.get_scheduler(), self.layout_manager.get_tcl_batch())
+        self.render_queue.flush = self.instrument("RenderQueue", "flushes", self.render_queue.flush)
+        # with a clock, coroutines are run to completion when they are started so that simulations are deterministic
+        self.async_loop: AsyncLoop = AsyncLoop(self.get_window(), synchronous=clock is not None)
         self.update_manager: UpdateManager = UpdateManager(self)
-        self.add_widgets(map(self.construct_widget, config["widgets"]))
-
-        self.layout_manager.evaluate_constraints()
-        self.layout_manager.place_all()
+        self.network_archive: NetworkArchive = NetworkArchive(self.config["network archive"]) if "network archive" in self.config else None
+        self.data_source_manager: DataSourceManager = DataSourceManager(self)
+        self.power_manager: PowerManager = PowerManager(self, self.config.get("power", {}))
+        self.page_manager: PageManager = PageManager(self, self.config.get("pages", {}))
+        self.add_widget_configs(self.config["widgets"])
+        # the first check shows a page even if the config has no pages, which evaluates the constraints and places the widgets
+        self.page_manager.check()
+
+    def create_layout_manager(self) -> LayoutManager:
+        """constructs the LayoutManager of the config, which creates the window. Overload to create a different window"""
+        return LayoutManager(self, self.config["window_config"], self.config["colors"], self.config["fonts"])
 
     def mainloop(self):
         """Adds all the method checkers and begins the tkinter window loop"""
+        self.start()
+        self.layout_manager.window.mainloop()
+        self.async_loop.stop()
+
+    def start(self):
+        """Adds all the method checkers"""
+        self.layout_manager.evaluate_constraints = self.instrument("LayoutManager", "constraint evaluations", self.layout_manager.evaluate_constraints)
+        self.layout_manager.place_all = self.instrument("LayoutManager", "relayouts", self.layout_manager.place_all)
+        self.config_watcher.check_for_changes = self.instrument("ConfigWatcher", "checks", self.config_watcher.check_for_changes)
+        self.power_manager.check = self.instrument("PowerManager", "checks", self.power_manager.check)
+        self.page_manager.check = self.instrument("PageManager", "checks", self.page_manager.check)
         self.update_manager.add_update_checkers(
             [self.layout_manager.evaluate_constraints, self.layout_manager.place_all], [SmartMirror.WIDGET_LOCATION_REFRESH, SmartMirror.WIDGET_LOCATION_REFRESH])
-        self.layout_manager.window.mainloop()
+        self.update_manager.add_update_checker(self.config_watcher.check_for_changes, SmartMirror.CONFIG_REFRESH)
+        self.power_manager.start()
+        self.page_manager.start()
+        if self.memory_profiler is not None:
+            self.memory_profiler.start()
+
+    def sleep(self):
+        """Hides all the widgets and pauses all the update checkers until the SmartMirror is woken up"""
+        self.update_manager.pause()
+        for widget in self.widgets.values():
+            widget.place_forget()
+
+    def wake(self):
+        """Resumes the update checkers, updating every widget once before they are placed again"""
+        self.update_manager.resume()
+
+    def show_page(self, page: str) -> None:
+        """
+        Parks the widgets of the other pages, and unparks the widgets of page, which are updated once before they are placed again
+        see PageManager for how pages are chosen
+        """
+        for widget_id, widget in self.widgets.items():
+            if self.page_manager.is_parked(widget):
+                self.park_widget(widget_id)
+            else:
+                self.unpark_widget(widget_id)
+        self.layout_manager.evaluate_constraints()
+        self.layout_manager.place_all()
+
+    def park_widget(self, widget_id: str) -> None:
+        """Hides the widget and excludes it from the layout, and pauses its updates and subscriptions until it is unparked"""
+        if widget_id in self.layout_manager.parked_widgets:
+            return
+        widget = self.widgets[widget_id]
+        self.layout_manager.parked_widgets.add(widget_id)
+        self.update_manager.park_widget_updater(widget_id)
+        widget.pause_subscriptions()
+        widget.place_forget()
+
+    def unpark_widget(self, widget_id: str) -> None:
+        """Updates the parked widget once and continues its updates and subscriptions. It is shown when it is placed again"""
+        if widget_id not in self.layout_manager.parked_widgets:
+            return
+        widget = self.widgets[widget_id]
+        self.layout_manager.parked_widgets.discard(widget_id)
+        self.update_manager.unpark_widget_updater(widget_id)
+        try:
+            widget.resume_subscriptions()
+        except Exception as e:
+            # the other widgets of the page are still unparked and placed
+            print(f"Subscriptions of widget {widget_id} failed when resumed:\n\t{type(e).__name__}: {e}")
 
     #######################
     # Widget Construction #
@@ -240,6 +433,22 @@ class SmartMirror:
         """passes widget construction to the widget constructor"""
         return WidgetConstructor.construct_widget(self, widget_config)
 
+    def add_widget_configs(self, widget_configs: [{}]) -> [str]:
+        """constructs and adds a widget for each widget config, returning the ids of the constructed widgets"""
+        return [self.add_widget_config(widget_config) for widget_config in widget_configs]
+
+    def add_widget_config(self, widget_config: {}) -> str:
+        """
+        constructs and adds the widget defined by widget_config
+        the widget is remembered by its config key so that later changes to its config can be applied to it
+
+        :return: the id of the constructed widget
+        """
+        widget = self.construct_widget(widget_config)
+        self.add_widget(widget)
+        self.widget_keys[ConfigDiff.get_widget_key(widget_config)] = widget.get_id()
+        return widget.get_id()
+
     def add_widgets(self, widgets: [BaseWidget]) -> None:
         """Adds all the widgets and their corresponding subwidgets, constraints, and update checkers"""
         for widget in widgets:
@@ -251,21 +460,157 @@ class SmartMirror:
         assert widget_id not in self.widgets.keys(), f"Error, ID already added\nAddedID = {widget_id}\n" + "Preexisting IDs:\n\t" + "\n\t".join(
             [f"widgets[{widget_id}] = {widget}" for widget_id, widget in self.widgets.items()])
         self.widgets[widget_id] = widget
-        self.add_str_constraints(widget.get_own_constraints())
+        if self.instruments:
+            widget.update_values = self.instrument(widget, "updates", widget.update_values)
+            widget.place = self.instrument(widget, "places", widget.place)
+        self.widget_constraints[widget_id] = self.add_str_constraints(widget.get_own_constraints())
         self.add_update_checker(widget)
+        if self.page_manager.is_parked(widget):
+            self.park_widget(widget_id)
         self.add_widgets(widget.subwidgets)
 
-    def add_constraints(self, constraints: [Constraint]) -> None:
+    def remove_widget(self, widget_id: str) -> [(str, str)]:
+        """
+        Removes a widget and its corresponding subwidgets, constraints, and update checkers
+
+        :return: the identifiers of the removed constraints
+        """
+        widget = self.widgets[widget_id]
+        removed_constraints = []
+        for subwidget in widget.subwidgets:
+            if subwidget.get_id() in self.widgets:
+                removed_constraints += self.remove_widget(subwidget.get_id())
+        removed_constraints += self.remove_constraints(widget_id)
+        self.update_manager.remove_widget_updater(widget_id)
+        self.layout_manager.parked_widgets.discard(widget_id)
+        for source, callback, _ in list(widget.subscriptions):
+            widget.unsubscribe(source, callback)
+        del self.widgets[widget_id]
+        widget.destroy()
+        return removed_constraints
+
+    def remove_constraints(self, widget_id: str) -> [(str, str)]:
+        """
+        Removes the constraints that were added by the widget with the given id
+
+        :return: the identifiers of the removed constraints
+        """
+        keys = self.widget_constraints.pop(widget_id, [])
+        self.layout_manager.remove_constraints(keys)
+        return keys
+
+    def add_constraints(self, constraints: [Constraint]) -> [(str, str)]:
         """Passes the given constraint descriptions to the LayoutManager to be constructed and handled"""
-        self.layout_manager.add_constraints(constraints)
+        return self.layout_manager.add_constraints(constraints)
 
-    def add_str_constraints(self, constraints: [str]) -> None:
+    def add_str_constraints(self, constraints: [str]) -> [(str, str)]:
         """Passes the given constraint descriptions to the LayoutManager to be constructed and handled"""
-        self.layout_manager.add_str_constraints(constraints)
+        return self.layout_manager.add_str_constraints(constraints)
 
     def add_update_checker(self, widget: BaseWidget) -> None:
-        """Registers the widget in the UpdateManager so that its value can be updated over time"""
-        self.update_manager.add_widget_updater(widget, widget.update_time)
+        """
+        Registers the widget in the UpdateManager so that its value can be updated over time
+        Widgets that subscribe to data sources are updated by the DataSourceManager instead
+        """
+        if not widget.subscriptions:
+            self.update_manager.add_widget_updater(widget, widget.update_time)
+
+    ########################
+    # Config Hot Reloading #
+    ########################
+
+    def apply_config(self, config: {}) -> bool:
+        """
+        Applies the difference between the running config and the given config
+        Widgets whose config did not change keep their data and update timers,
+        and only the constraints that are affected by the change are reevaluated
+        The config is checked first (see ConfigValidator) and ignored if it has errors, such as constraints that
+        reference removed widgets. If applying it fails anyway, such as when a widget rejects its props,
+        the running config is restored so that the mirror is never left half updated
+
+        :return: True if the config was applied
+        """
+        errors = ConfigValidator.get_errors(config)
+        if errors:
+            print("Config has errors and will be ignored:\n\t" + "\n\t".join(errors))
+            return False
+        diff = ConfigDiff(self.config, config)
+        for section in diff.restart_sections:
+            print(f"Changes to the \"{section}\" section of the config are applied when the mirror restarts")
+        if diff.is_empty():
+            return True
+        print(f"Applying config changes:{diff}")
+        try:
+            self.apply_diff(diff, config)
+        except Exception as e:
+            print(f"Config could not be applied, restoring the running config:\n\t{type(e).__name__}: {e}")
+            self.restore_config(self.config)
+            return False
+        self.config = config
+        return True
+
+    def apply_diff(self, diff: ConfigDiff, config: {}) -> None:
+        """applies the changes of diff, whose new config is config, see SmartMirror.apply_config"""
+        if diff.window_changed:
+            self.layout_manager.set_conversion(config["window_config"])
+            self.layout_manager.configure_window()
+        if diff.colors_changed:
+            self.layout_manager.set_colors(config["colors"])
+        if diff.fonts_changed:
+            self.layout_manager.set_fonts(config["fonts"])
+        if diff.power_changed:
+            self.power_manager.set_config(config.get("power", {}))
+        if diff.pages_changed:
+            self.page_manager.set_config(config.get("pages", {}))
+
+        changed_constraints = []
+        for key in diff.removed + list(diff.rebuilt.keys()):
+            changed_constraints += self.remove_widget(self.widget_keys.pop(key))
+        for key, constraints in diff.constraints_changed.items():
+            widget_id = self.widget_keys[key]
+            changed_constraints += self.remove_constraints(widget_id)
+            self.widget_constraints[widget_id] = self.add_str_constraints(constraints)
+            changed_constraints += self.widget_constraints[widget_id]
+        existing_widget_ids = set(self.widgets.keys())
+        self.add_widget_configs(list(diff.added.values()) + list(diff.rebuilt.values()))
+        new_widget_ids = [widget_id for widget_id in self.widgets if widget_id not in existing_widget_ids]
+        for widget_id in new_widget_ids:
+            changed_constraints += self.widget_constraints[widget_id]
+
+        if diff.window_changed:
+            self.layout_manager.evaluate_constraints()
+            self.layout_manager.place_all()
+        else:
+            affected = self.layout_manager.get_affected_constraints(changed_constraints)
+            self.layout_manager.evaluate_constraints(affected)
+            to_place = set(new_widget_ids) | {obj for obj, prop in affected if obj in self.widgets}
+            if diff.font_family_changed:
+                # widgets fit text in "auto" fonts again when they are placed, see FontRegistry.set_config
+                to_place |= set(self.widgets)
+            self.layout_manager.place_widgets([widget_id for widget_id in self.widgets if widget_id in to_place])
+
+    def restore_config(self, config: {}) -> None:
+        """
+        Reconstructs every widget and reapplies every section of config
+        used when applying a config failed part way, which may have left widgets and constraints of both configs
+        """
+        subwidget_ids = {subwidget.get_id() for widget in self.widgets.values() for subwidget in widget.subwidgets}
+        for widget_id in [widget_id for widget_id in self.widgets if widget_id not in subwidget_ids]:
+            self.remove_widget(widget_id)
+        for widget_id in list(self.widgets):
+            self.remove_widget(widget_id)
+        self.layout_manager.constraints.clear()
+        self.widget_constraints.clear()
+        self.widget_keys.clear()
+        self.layout_manager.set_conversion(config["window_config"])
+        self.layout_manager.configure_window()
+        self.layout_manager.set_colors(config["colors"])
+        self.layout_manager.set_fonts(config["fonts"])
+        self.power_manager.set_config(config.get("power", {}))
+        self.page_manager.set_config(config.get("pages", {}))
+        self.add_widget_configs(config["widgets"])
+        self.layout_manager.evaluate_constraints()
+        self.layout_manager.place_all()
 
     ####################
     # Protocol Methods #
@@ -280,6 +625,66 @@ class SmartMirror:
         """
         return self.layout_manager.get_window()
 
+    def get_scheduler(self):
+        """
+        returns the object used to schedule calls: the clock if one was given, otherwise the tkinter window
+
+        method required by UpdateManager and RenderQueue to schedule method calls
+        """
+        return self.clock if self.clock is not None else self.get_window()
+
+    def get_time(self) -> datetime.datetime:
+        """
+        returns the current time of the clock if one was given, otherwise the real current time
+
+        method required by BaseWidget so that widgets that display the time can be simulated
+        """
+        return self.clock.now() if self.clock is not None else datetime.datetime.now()
+
+    def get_render_queue(self) -> RenderQueue:
+        """
+        returns the RenderQueue that applies the options of the tkinter widgets in the window
+
+        method required by BaseWidget to set the options of its tkinter widgets
+        """
+        return self.render_queue
+
+    def get_tcl_batch(self):
+        """
+        returns the TclBatch that collects the geometry and configure commands of a layout pass
+
+        method required by BaseWidget to place its tkinter widgets
+        """
+        return self.layout_manager.get_tcl_batch()
+
+    def get_async_loop(self) -> AsyncLoop:
+        """
+        returns the AsyncLoop that runs the coroutines of async widget methods
+
+        method required by UpdateManager to run async update_values, and by BaseWidget to set options from coroutines
+        """
+        return self.async_loop
+
+    def get_data_sources(self) -> DataSourceManager:
+        """
+        returns the DataSourceManager that widgets subscribe to data sources through
+
+        method required by BaseWidget to subscribe to data sources
+        """
+        return self.data_source_manager
+
+    def instrument(self, owner, kind: str, func):
+        """
+        returns func wrapped by each of the instruments so that its calls are measured as calls of the given kind made by owner
+        an instrument has a method wrap(owner, kind, func) that returns the wrapped func, see Simulation.CallStats
+        func is returned as is if there are no instruments
+
+        method required by BaseWidget to measure its subscription updates and the construction of its LazyOptions
+        """
+        for instrument in self.instruments:
+            func = instrument.wrap(owner, kind, func)
+        return func
+
     def get_unused_id(self, w) -> str:
         """
         see LayoutManager.get_unused_id:
@@ -295,6 +700,10 @@ class SmartMirror:
         """returns the dictionary of colors"""
         return self.layout_manager.get_fonts()
 
+    def get_font_registry(self):
+        """see LayoutManager.get_font_registry"""
+        return self.layout_manager.get_font_registry()
+
     ##################
     # Helper Methods #
     ##################
@@ -307,7 +716,7 @@ class SmartMirror:
 
     def __str__(self):
         """gives details about the SmartMirror's LayoutManager and Widgets"""
-        return "\nLayout Manager = " + "\n\t".join(str(self.layout_manager).split("\n")) + "\nWidgets = \n\t" + "\n\t".join(map(lambda t: f"{t[0]}\t:\t{t[1]}", self.widgets.items())) +"\n"
+        return "\nLayout Manager = " + "\n\t".join(str(self.layout_manager).split("\n")) + "\n" + str(self.data_source_manager) + "\nWidgets = \n\t" + "\n\t".join(map(lambda t: f"{t[0]}\t:\t{t[1]}", self.widgets.items())) +"\n"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""
+Measures the cold start of the SmartMirror up to its first paint, broken down into the imports, parsing the config,
+constructing each widget, evaluating the constraints and placing the widgets
+Each run starts a new python process so that the imports are cold, and data sources are simulated so that no time
+is spent waiting for the network. The median of the runs is reported
+Unless a display is used, the widgets are in a headless window (see create_headless_window), so no display is needed,
+and the first paint only measures the Tcl commands of the widgets, not the time Tk spends drawing them
+
+Baselines store the medians of a machine so that later runs can be checked against them:
+    python StartupBenchmark.py --save-baseline     saves the medians as the baseline
+    python StartupBenchmark.py --check             fails if a phase got slower than the baseline by more than the tolerance
+
+Usage: python StartupBenchmark.py [--config config/config.json] [--runs 5] [--baseline config/startup_baseline.json]
+                                  [--save-baseline | --check] [--tolerance 0.25] [--display] [--json]
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+
+# modules imported before the SmartMirror is constructed, in the order they are imported
+startup_imports = ["tkinter", "PIL.Image", "PIL.ImageTk", "google_auth_oauthlib.flow", "google.auth.transport.requests",
+                   "Widgets.WidgetConstructor", "SmartMirror"]
+# modules that are only imported once a data source is first fetched
+deferred_imports = ["googleapiclient.discovery"]
+
+
+class PhaseTimer:
+    """
+    Keeps track of the time spent in each phase of the start
+    Time is exclusive: time spent in a nested timed function only counts towards the nested function's phase
+    """
+
+    def __init__(self):
+        self.phases: {str: float} = {}
+        self.nested_time: [float] = []
+
+    def wrap(self, phase: str, func):
+        """returns a function that calls func and adds the time it takes to phase"""
+        def timed(*args, **kargs):
+            self.nested_time.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.phases[phase] = self.phases.get(phase, 0.0) + elapsed - self.nested_time.pop()
+                if self.nested_time:
+                    self.nested_time[-1] += elapsed
+        return timed
+
+    def time(self, phase: str, func, *args, **kargs):
+        """calls func with args and kargs and adds the time it takes to phase"""
+        return self.wrap(phase, func)(*args, **kargs)
+
+
+def run_once(config_path: pathlib.Path, display: bool = False) -> {}:
+    """
+    starts the SmartMirror defined by the config at config_path once and returns the time of each phase and widget
+
+    :param display: if True, the widgets are in a real window, which needs a display
+    """
+    start = time.perf_counter()
+    timer = PhaseTimer()
+    for module in startup_imports:
+        timer.time(f"import {module}", importlib.import_module, module)
+    from HeadlessLayout import HeadlessWindowLayoutManager
+    from SmartMirror import SmartMirror
+    widget_times: {str: {str: object}} = {}
+
+    class StartupSmartMirror(SmartMirror):
+        """SmartMirror that times parsing its config, the construction of each widget and its first layout"""
+
+        @staticmethod
+        def parse_json(file_name: pathlib.Path or str):
+            return timer.time("parse config", SmartMirror.parse_json, file_name)
+
+        def construct_widget(self, widget_config: {}):
+            widget_start = time.perf_counter()
+            widget = timer.time(f"construct {widget_config['name']}", SmartMirror.construct_widget, self, widget_config)
+            widget_times[widget.get_id()] = {"name": widget_config["name"], "constructed as": type(widget).__name__,
+                                             "seconds": time.perf_counter() - widget_start}
+            return widget
+
+        def create_layout_manager(self):
+            if display:
+                return SmartMirror.create_layout_manager(self)
+            return HeadlessWindowLayoutManager(self, self.config["window_config"], self.config["colors"], self.config["fonts"])
+
+        def add_widget_configs(self, widget_configs: [{}]) -> [str]:
+            widget_ids = SmartMirror.add_widget_configs(self, widget_configs)
+            self.layout_manager.evaluate_constraints = timer.wrap("evaluate constraints", self.layout_manager.evaluate_constraints)
+            self.layout_manager.place_all = timer.wrap("place widgets", self.layout_manager.place_all)
+            return widget_ids
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        smart_mirror = timer.time("construct SmartMirror", StartupSmartMirror, config_path, simulate_sources=True)
+        timer.time("first paint", smart_mirror.render_queue.flush)
+        timer.time("first paint", smart_mirror.get_window().update)
+        first_paint = time.perf_counter() - start
+        for module in deferred_imports:
+            try:
+                timer.time(f"deferred import {module}", importlib.import_module, module)
+            except ImportError:
+                continue
+        smart_mirror.get_window().destroy()
+    return {"time to first paint": first_paint, "widgets": len(smart_mirror.config["widgets"]), "phases": timer.phases, "widget times": widget_times}
+
+
+def run(config_path: pathlib.Path, runs: int, display: bool = False) -> {}:
+    """starts the SmartMirror in runs new processes and returns the median of each phase and widget, see run_once"""
+    results = []
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, __file__, "--config", str(config_path), "--worker"] + (["--display"] if display else []),
+                                 stdout=subprocess.PIPE, text=True, check=True)
+        results.append(json.loads(process.stdout))
+    phases = {phase: statistics.median(result["phases"].get(phase, 0.0) for result in results) for phase in results[0]["phases"]}
+    widget_times = {widget_id: dict(times, seconds=statistics.median(result["widget times"][widget_id]["seconds"] for result in results))
+                    for widget_id, times in results[0]["widget times"].items()}
+    return {"runs": runs, "time to first paint": statistics.median(result["time to first paint"] for result in results),
+            "phases": phases, "widget times": widget_times}
+
+
+def check(report: {}, baseline: {}, tolerance: float, min_difference: float = 0.005) -> [str]:
+    """
+    returns the regressions of the report: the phases that took longer than in the baseline by more than the tolerance
+    (a fraction of the baseline's time) and by more than min_difference seconds, which ignores noise in very short phases
+    """
+    times = dict(report["phases"], **{"time to first paint": report["time to first paint"]})
+    baseline_times = dict(baseline["phases"], **{"time to first paint": baseline["time to first paint"]})
+    regressions = []
+    for phase, seconds in times.items():
+        baseline_seconds = baseline_times.get(phase, None)
+        if baseline_seconds is not None and seconds > baseline_seconds * (1 + tolerance) and seconds - baseline_seconds > min_difference:
+            regressions.append(f"{phase} took {seconds:.4f}s, baseline {baseline_seconds:.4f}s")
+    return regressions
+
+
+def format_report(report: {}) -> str:
+    """formats the report returned by run as a table of phases and a table of widgets"""
+    lines = [f"time to first paint: {report['time to first paint']:.4f}s (median of {report['runs']} runs)", "phase | seconds"]
+    for phase, seconds in sorted(report["phases"].items(), key=lambda t: -t[1]):
+        lines.append(f"{phase} | {seconds:.4f}")
+    lines.append("widget | type | constructed as | seconds")
+    for widget_id, times in report["widget times"].items():
+        lines.append(f"{widget_id} | {times['name']} | {times['constructed as']} | {times['seconds']:.4f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the cold start of the SmartMirror up to its first paint")
+    parser.add_argument("--config", type=pathlib.Path, default=pathlib.Path("config/config.json"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", type=pathlib.Path, default=pathlib.Path("config/startup_baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="saves the medians of the runs as the baseline")
+    parser.add_argument("--check", action="store_true", help="exits with status 1 if a phase is slower than the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="fraction a phase may be slower than the baseline")
+    parser.add_argument("--display", action="store_true", help="puts the widgets in a real window, which needs a display, "
+                                                                  "instead of a headless one")
+    parser.add_argument("--json", action="store_true", help="prints the report as json")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(run_once(args.config, args.display)))
+        sys.exit(0)
+    if args.check and not args.save_baseline and not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, save one first with --save-baseline", file=sys.stderr)
+        sys.exit(1)
+    startup_report = run(args.config, args.runs, args.display)
+    print(json.dumps(startup_report, indent=2) if args.json else format_report(startup_report))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(startup_report, indent=2))
+        print(f"Saved baseline {args.baseline}")
+    if args.check:
+        startup_regressions = check(startup_report, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in startup_regressions:
+            print(f"Regression: {regression}")
+        sys.exit(1 if startup_regressions else 0)
@@ -0,0 +1,75 @@
+"""
+Compares applying the commands of a layout pass with one tkinter call per command against applying them
+as one Tcl script through a TclBatch. Each widget is placed and has the text of a label configured in every pass
+
+Usage: python TclBatchBenchmark.py [--widgets 10 100 1000] [--passes 50] [--json]
+"""
+import argparse
+import json
+import time
+import tkinter
+from Widgets.TclBatch import TclBatch
+
+
+def create_widgets(window: tkinter.Tk, count: int) -> [(tkinter.Frame, tkinter.Label)]:
+    """creates count frames that each contain a label"""
+    widgets = []
+    for _ in range(count):
+        frame = tkinter.Frame(window)
+        label = tkinter.Label(frame)
+        label.pack()
+        widgets.append((frame, label))
+    return widgets
+
+
+def per_call_pass(widgets: [(tkinter.Frame, tkinter.Label)], i: int) -> None:
+    """places and configures every widget with a tkinter call per command"""
+    for n, (frame, label) in enumerate(widgets):
+        frame.place(x=(n + i) % 500, y=n % 300, width=100, height=50)
+        label.config(text=f"{n} {i}")
+
+
+def batched_pass(tcl_batch: TclBatch, widgets: [(tkinter.Frame, tkinter.Label)], i: int) -> None:
+    """places and configures every widget with one Tcl script"""
+    with tcl_batch:
+        for n, (frame, label) in enumerate(widgets):
+            tcl_batch.place(frame, x=(n + i) % 500, y=n % 300, width=100, height=50)
+            tcl_batch.configure(label, text=f"{n} {i}")
+
+
+def time_passes(layout_pass, passes: int) -> float:
+    """returns the mean time in seconds of a pass"""
+    start = time.perf_counter()
+    for i in range(passes):
+        layout_pass(i)
+    return (time.perf_counter() - start) / passes
+
+
+def benchmark(widget_counts: [int], passes: int) -> {int: {str: float}}:
+    """returns the mean time of a per call pass and of a batched pass for every number of widgets"""
+    report = {}
+    for count in widget_counts:
+        window = tkinter.Tk()
+        window.withdraw()
+        widgets = create_widgets(window, count)
+        tcl_batch = TclBatch(window)
+        per_call = time_passes(lambda i: per_call_pass(widgets, i), passes)
+        batched = time_passes(lambda i: batched_pass(tcl_batch, widgets, i), passes)
+        window.destroy()
+        report[count] = {"per call": round(per_call, 6), "batched": round(batched, 6), "speedup": round(per_call / batched, 2)}
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compares per call and batched application of place and configure commands")
+    parser.add_argument("--widgets", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--passes", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="prints the report as json")
+    args = parser.parse_args()
+    benchmark_report = benchmark(args.widgets, args.passes)
+    if args.json:
+        print(json.dumps(benchmark_report, indent=2))
+    else:
+        print("widgets | per call (s) | batched (s) | speedup")
+        for widget_count, times in benchmark_report.items():
+            print(f"{widget_count:7} | {times['per call']:12.6f} | {times['batched']:11.6f} | {times['speedup']:6.2f}x")
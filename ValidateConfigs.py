@@ -0,0 +1,170 @@
+"""
+Validates many mirror configs in parallel without a tkinter window or network access
+For each config, the constraints are constructed and checked for unknown widgets, over-constrained dimensions and cycles,
+and the final rectangle of every widget is computed. The report is printed as json
+
+Usage: python ValidateConfigs.py CONFIG_OR_DIRECTORY [CONFIG_OR_DIRECTORY ...] [--jobs N] [--output report.json]
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import pathlib
+import sys
+import time
+from HeadlessLayout import HeadlessLayoutManager
+from Widgets.BaseWidget import LayoutManagerHelper
+from Widgets.Dimensions import Expression
+
+
+class ConfigValidator:
+    """Validates a single config and collects its errors, warnings and the rectangles of its widgets"""
+    required_sections = ["window_config", "colors", "fonts", "widgets"]
+    widgets_path = pathlib.Path("Widgets")
+
+    def __init__(self, config_path: pathlib.Path):
+        self.config_path = pathlib.Path(config_path)
+        self.errors: [str] = []
+        self.warnings: [str] = []
+        self.rects: {str: {str: int}} = {}
+
+    def validate(self) -> {}:
+        """validates the config and returns the report of the config"""
+        start = time.perf_counter()
+        try:
+            self.check_config()
+        except Exception as e:
+            self.errors.append(f"{type(e).__name__}: {e}")
+        return {
+            "path": str(self.config_path),
+            "valid": not self.errors,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "rects": self.rects,
+            "seconds": round(time.perf_counter() - start, 6),
+        }
+
+    @staticmethod
+    def get_errors(config: {}) -> [str]:
+        """returns the errors of a config that was already parsed, such as a config about to be applied to a running mirror"""
+        validator = ConfigValidator("<running config>")
+        try:
+            validator.check(config)
+        except Exception as e:
+            validator.errors.append(f"{type(e).__name__}: {e}")
+        return validator.errors
+
+    def check_config(self) -> None:
+        """parses the config file and checks it"""
+        with open(self.config_path) as config_file:
+            config = json.load(config_file)
+        self.check(config)
+
+    def check(self, config: {}) -> None:
+        """runs each check, stopping at the first check that makes the following checks meaningless"""
+        missing = [section for section in ConfigValidator.required_sections if section not in config]
+        if missing:
+            self.errors.append(f"Missing sections: {missing}")
+            return
+        layout_manager = HeadlessLayoutManager(config)
+        self.check_widget_names(layout_manager)
+        self.check_references(layout_manager)
+        self.check_dimensions(layout_manager)
+        if self.errors:
+            return
+        self.check_cycles(layout_manager)
+        if self.errors:
+            return
+        for widget_id, ((x, y), (width, height)) in layout_manager.get_rects().items():
+            self.rects[widget_id] = {"x": x, "y": y, "width": width, "height": height}
+
+    def check_widget_names(self, layout_manager: HeadlessLayoutManager) -> None:
+        """warns about widgets whose type is neither a built in widget nor an addon widget"""
+        for widget_id, widget in layout_manager.widgets.items():
+            if not (ConfigValidator.widgets_path / f"{widget.name}.py").exists() and not (ConfigValidator.widgets_path / "AddonWidgets" / widget.name).is_dir():
+                self.warnings.append(f"Widget {widget_id} has the unknown type {widget.name}")
+
+    def check_references(self, layout_manager: HeadlessLayoutManager) -> None:
+        """checks that constraints only constrain known properties and reference widgets that exist"""
+        for (obj, prop), constraint in layout_manager.constraints.items():
+            if obj not in layout_manager.widgets:
+                self.errors.append(f"Constraint {obj}.{prop} constrains the unknown widget {obj}")
+                continue
+            if prop not in LayoutManagerHelper.x_dimensions + LayoutManagerHelper.y_dimensions:
+                self.errors.append(f"Constraint {obj}.{prop} constrains the unknown property {prop}")
+            for expression in constraint.expressions:
+                if type(expression) != Expression or expression.obj is None:
+                    continue
+                widget_id = constraint.get_widget_id(expression.obj)
+                if widget_id not in layout_manager.widgets:
+                    self.errors.append(f"Constraint {obj}.{prop} references the unknown widget {expression.obj}")
+                elif expression.prop not in LayoutManagerHelper.x_dimensions + LayoutManagerHelper.y_dimensions:
+                    self.errors.append(f"Constraint {obj}.{prop} references the unknown property {expression.obj}.{expression.prop}")
+
+    def check_dimensions(self, layout_manager: HeadlessLayoutManager) -> None:
+        """checks that no widget has more than two constraints along a dimension, see LayoutManagerHelper.assert_no_conflicting_constraints"""
+        for widget_id in layout_manager.widgets:
+            for axis, dimensions in [("x", LayoutManagerHelper.x_dimensions), ("y", LayoutManagerHelper.y_dimensions)]:
+                constrained = [prop for obj, prop in layout_manager.constraints if obj == widget_id and prop in dimensions]
+                if len(constrained) > 2:
+                    self.errors.append(f"Widget {widget_id} is over-constrained along the {axis} dimension: {constrained}")
+
+    def check_cycles(self, layout_manager: HeadlessLayoutManager) -> None:
+        """checks that no constraint depends on itself through the constraints it depends on"""
+        visiting, visited = [], set()
+
+        def visit(key):
+            if key in visited:
+                return
+            if key in visiting:
+                cycle = visiting[visiting.index(key):] + [key]
+                self.errors.append("Constraint cycle: " + " -> ".join(map(lambda k: f"{k[0]}.{k[1]}", cycle)))
+                return
+            visiting.append(key)
+            for dependent in layout_manager.constraints[key].get_dependents():
+                if dependent in layout_manager.constraints and dependent != key:
+                    visit(dependent)
+            visiting.pop()
+            visited.add(key)
+
+        for constraint_key in layout_manager.constraints:
+            visit(constraint_key)
+
+
+def validate_config(config_path: pathlib.Path) -> {}:
+    """validates the config at config_path and returns its report. Called by the worker processes"""
+    return ConfigValidator(config_path).validate()
+
+
+def find_configs(paths: [pathlib.Path]) -> [pathlib.Path]:
+    """returns the given config paths, with directories replaced by the json files inside of them"""
+    configs = []
+    for path in paths:
+        configs += sorted(path.glob("*.json")) if path.is_dir() else [path]
+    return configs
+
+
+def validate_configs(config_paths: [pathlib.Path], jobs: int = None) -> {}:
+    """validates the configs across a pool of jobs processes and returns the report of all the configs"""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        reports = list(executor.map(validate_config, config_paths, chunksize=max(1, len(config_paths) // 64)))
+    return {
+        "valid": sum(report["valid"] for report in reports),
+        "invalid": sum(not report["valid"] for report in reports),
+        "seconds": round(time.perf_counter() - start, 6),
+        "configs": reports,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validates mirror configs and computes their layouts without a window or network")
+    parser.add_argument("paths", type=pathlib.Path, nargs="+", help="config files, or directories of config files")
+    parser.add_argument("--jobs", type=int, default=None, help="number of worker processes, defaults to the number of CPUs")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="writes the report to this file instead of printing it")
+    args = parser.parse_args()
+    report = validate_configs(find_configs(args.paths), args.jobs)
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        args.output.write_text(json.dumps(report, indent=2))
+    sys.exit(1 if report["invalid"] else 0)
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import hashlib
+import mmap
+import pathlib
+from PIL import Image
+
+
+class AssetCache:
+    """
+    Display-size variants of image assets
+    Variants are baked ahead of time by AssetBaker.py as raw RGBA files, keyed by the hash of the source and the size,
+    so that they can be memory-mapped without decoding or resampling
+    Assets without a baked variant are resized when they are first loaded
+    The max_loaded most recently loaded variants are kept, so variants of sizes that are no longer displayed are freed
+    """
+    cache_path = pathlib.Path("assets/.baked")
+    source_hashes: {(str, int): str} = {}
+    max_loaded = 32
+    loaded: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def get_source_hash(source: str) -> str:
+        """returns the hash of the source file's contents, which is only computed again if the file is modified"""
+        path = pathlib.Path(source)
+        key = (str(path), path.stat().st_mtime_ns)
+        if key not in AssetCache.source_hashes:
+            AssetCache.source_hashes[key] = hashlib.sha1(path.read_bytes()).hexdigest()
+        return AssetCache.source_hashes[key]
+
+    @staticmethod
+    def get_variant_path(source: str, size: (int, int)) -> pathlib.Path:
+        """returns the path of the baked variant of source at size"""
+        return AssetCache.cache_path / f"{AssetCache.get_source_hash(source)}_{size[0]}x{size[1]}.rgba"
+
+    @staticmethod
+    def resize(source: str, size: (int, int)) -> Image.Image:
+        """decodes source and resizes it to size"""
+        with Image.open(source) as image:
+            return image.resize(size, Image.LANCZOS).convert("RGBA")
+
+    @staticmethod
+    def bake(source: str, size: (int, int)) -> pathlib.Path:
+        """writes the variant of source at size if it does not exist yet, and returns its path"""
+        variant = AssetCache.get_variant_path(source, size)
+        if not variant.exists():
+            variant.parent.mkdir(parents=True, exist_ok=True)
+            temporary = variant.with_suffix(".tmp")
+            temporary.write_bytes(AssetCache.resize(source, size).tobytes())
+            temporary.replace(variant)
+        return variant
+
+    @staticmethod
+    def load(source: str, size: (int, int)) -> Image.Image:
+        """
+        returns source as an RGBA image of the given size, memory-mapping the baked variant if one exists
+        images are shared between callers, so they must be copied before being modified
+        """
+        size = tuple(size)
+        key = (str(source), size)
+        if key not in AssetCache.loaded:
+            variant = AssetCache.get_variant_path(source, size)
+            if variant.exists() and variant.stat().st_size == size[0] * size[1] * 4 > 0:
+                with open(variant, "rb") as variant_file:
+                    mapped = mmap.mmap(variant_file.fileno(), 0, access=mmap.ACCESS_READ)
+                AssetCache.loaded[key] = Image.frombuffer("RGBA", size, mapped, "raw", "RGBA", 0, 1)
+            else:
+                AssetCache.loaded[key] = AssetCache.resize(source, size)
+            if len(AssetCache.loaded) > AssetCache.max_loaded:
+                AssetCache.loaded.popitem(last=False)
+        else:
+            AssetCache.loaded.move_to_end(key)
+        return AssetCache.loaded[key]
@@ -0,0 +1,153 @@
+import asyncio
+import concurrent.futures
+import os
+import queue
+import threading
+import tkinter
+
+
+class AsyncLoop:
+    """
+    Runs the coroutines of async widget methods, such as an async update_values, on an asyncio event loop in a
+    background thread, so that a widget can wait for several things at once without blocking the window
+    Results are passed back to the window's thread through a pipe that the window watches with a file handler,
+    so neither thread polls. Where file handlers are not supported (Windows), a virtual event is generated instead
+
+    Coroutines are run for a key, such as the LoopMethod that calls a widget's update_values. Running a coroutine
+    cancels the unfinished coroutine of the same key, and so does cancelling the key
+    """
+    event_name = "<<AsyncLoopResults>>"
+
+    def __init__(self, window: tkinter.Tk, synchronous: bool = False):
+        """
+        Initializes an AsyncLoop. The event loop and its thread are started when the first coroutine is run
+
+        :param window: the tkinter window whose thread the results are passed to
+        :param synchronous: if True, coroutines are run to completion in the window's thread when they are run,
+            which keeps simulations deterministic. Their awaits are not virtualized: asyncio.sleep and timeouts take
+            real time, and do not advance the simulation's VirtualClock
+        """
+        self.window = window
+        self.synchronous = synchronous
+        self.window_thread = threading.current_thread()
+        self.loop: asyncio.AbstractEventLoop = None
+        self.thread: threading.Thread = None
+        self.futures: {object: concurrent.futures.Future} = {}
+        self.calls = queue.SimpleQueue()
+        self.read_fd, self.write_fd = None, None
+
+    def start(self) -> None:
+        """creates the event loop, starts its thread and watches the pipe that wakes the window's thread"""
+        self.loop = asyncio.new_event_loop()
+        if self.synchronous:
+            return
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+        try:
+            self.window.tk.createfilehandler(self.read_fd, tkinter.READABLE, self.on_readable)
+        except AttributeError:
+            os.close(self.read_fd)
+            os.close(self.write_fd)
+            self.read_fd, self.write_fd = None, None
+            self.window.bind(AsyncLoop.event_name, lambda event: self.call_pending())
+        self.thread = threading.Thread(target=self.loop.run_forever, name="AsyncLoop", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """cancels the unfinished coroutines and stops the event loop's thread"""
+        for key in list(self.futures):
+            self.cancel(key)
+        if self.thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.thread = None
+        if self.read_fd is not None:
+            self.window.tk.deletefilehandler(self.read_fd)
+            os.close(self.read_fd)
+            os.close(self.write_fd)
+            self.read_fd, self.write_fd = None, None
+
+    ##############
+    # Coroutines #
+    ##############
+
+    def run(self, key, coroutine, callback) -> None:
+        """
+        runs the coroutine and calls callback with its return value in the window's thread
+        the unfinished coroutine of the same key is cancelled, and its callback is not called
+        if the coroutine raises an exception, it is printed and callback is not called
+        """
+        if self.loop is None:
+            self.start()
+        self.cancel(key)
+        if self.synchronous:
+            try:
+                result = self.loop.run_until_complete(coroutine)
+            except Exception as e:
+                print(f"Coroutine of {key} failed:\n\t{type(e).__name__}: {e}")
+                return
+            callback(result)
+            return
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        self.futures[key] = future
+        future.add_done_callback(lambda f: self.call_in_window(self.finish, key, f, callback))
+
+    def finish(self, key, future, callback) -> None:
+        """calls callback with the result of the future, unless the future was cancelled or superseded"""
+        if self.futures.get(key, None) is not future:
+            return
+        del self.futures[key]
+        if future.cancelled():
+            return
+        exception = future.exception()
+        if exception is not None:
+            print(f"Coroutine of {key} failed:\n\t{type(exception).__name__}: {exception}")
+            return
+        callback(future.result())
+
+    def cancel(self, key) -> None:
+        """cancels the unfinished coroutine of the key, if there is one"""
+        future = self.futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    ##########################
+    # Window Thread Messages #
+    ##########################
+
+    def in_window_thread(self) -> bool:
+        """returns True if called from the window's thread, where tkinter may be used"""
+        return threading.current_thread() is self.window_thread
+
+    def call_in_window(self, func, *args, **kargs) -> None:
+        """calls func with args and kargs in the window's thread: immediately if called from it, otherwise once the window wakes up"""
+        if self.in_window_thread():
+            func(*args, **kargs)
+            return
+        self.calls.put((func, args, kargs))
+        if self.write_fd is not None:
+            os.write(self.write_fd, b"\0")
+        else:
+            self.window.event_generate(AsyncLoop.event_name, when="tail")
+
+    def on_readable(self, file, mask) -> None:
+        """called by the window when the pipe has been written to"""
+        try:
+            while os.read(self.read_fd, 4096):
+                continue
+        except BlockingIOError:
+            pass
+        self.call_pending()
+
+    def call_pending(self) -> None:
+        """calls the functions passed to call_in_window from other threads"""
+        while True:
+            try:
+                func, args, kargs = self.calls.get_nowait()
+            except queue.Empty:
+                return
+            func(*args, **kargs)
+
+    def __str__(self) -> str:
+        """gives the number of unfinished coroutines"""
+        return f"AsyncLoop: {'synchronous' if self.synchronous else 'running' if self.thread is not None else 'stopped' if self.loop is not None else 'not started'}, {len(self.futures)} unfinished coroutines"
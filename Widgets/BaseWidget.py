@@ -1,4 +1,5 @@
 import tkinter
+from Widgets.RenderQueue import LazyOption
 
 
 class LayoutManagerHelper:
@@ -114,7 +115,12 @@ class BaseWidget(tkinter.Frame):
         self.update_time = BaseWidget.prop_get(props, "update time", None, is_acceptable=(lambda x: x is None or x > 0))
         self.interactable = BaseWidget.prop_get(props, "interactable", False)
         if self.interactable: self.bind("<Button-1>", self.on_click)
+        self.subscriptions = []
+        # the widget this widget is a subwidget of, the parent of every widget is the SmartMirror
+        self.parent_widget = None
         self.subwidgets = list(map(self.parent.construct_widget, subwidgets))
+        for subwidget in self.subwidgets:
+            subwidget.parent_widget = self
 
     def __setattr__(self, key, value):
         """overloads __setattr__ such that if the property is pertinent to layouts,
@@ -144,6 +150,78 @@ class BaseWidget(tkinter.Frame):
         """returns an ID in the widget's layout manager that the widget w can take"""
         return self.parent.get_unused_id(w)
 
+    def get_time(self):
+        """returns the current time as a datetime. Use this instead of datetime.now so that the widget can be simulated"""
+        return self.parent.get_time()
+
+    def get_render_queue(self):
+        """returns the RenderQueue that applies the options of the tkinter widgets in the window"""
+        return self.parent.get_render_queue()
+
+    def set_options(self, tk_widget: tkinter.Misc, **options) -> None:
+        """
+        sets the options (text, image, ...) that tk_widget should display
+        only options that differ from what is displayed are applied, and they are applied together once per frame
+        wrap values that are expensive to construct in a LazyOption so that they are only constructed when they change
+        may be called from the coroutine of an async update_values, in which case the options are set in the window's thread
+        """
+        if not self.get_async_loop().in_window_thread():
+            self.get_async_loop().call_in_window(self.set_options, tk_widget, **options)
+            return
+        for option, value in options.items():
+            if isinstance(value, LazyOption):
+                options[option] = LazyOption(value.key, self.instrument(self, "constructed options", value.factory))
+        self.get_render_queue().set(tk_widget, **options)
+
+    def get_tcl_batch(self):
+        """
+        returns the TclBatch used to place and configure tkinter widgets
+        commands given while the widget is placed are applied together with the other widgets' commands, see TclBatch
+        """
+        return self.parent.get_tcl_batch()
+
+    def get_async_loop(self):
+        """returns the AsyncLoop that runs the coroutines of async widget methods, see AsyncLoop"""
+        return self.parent.get_async_loop()
+
+    def get_data_sources(self):
+        """returns the manager of the data sources that the widget can subscribe to"""
+        return self.parent.get_data_sources()
+
+    def subscribe(self, source, callback):
+        """
+        subscribes callback to the data source so that it is called with the source's data every time it is fetched
+        the source is fetched at least as often as the widget's update time, and widgets that subscribe
+        to equal sources share the same fetches
+        a widget with subscriptions is updated by its subscriptions instead of update_values
+
+        :return: the shared source that callback was subscribed to
+        """
+        instrumented_callback = self.instrument(self, "subscription updates", callback)
+        source = self.get_data_sources().subscribe(source, instrumented_callback, self.update_time)
+        self.subscriptions.append((source, callback, instrumented_callback))
+        return source
+
+    def unsubscribe(self, source, callback) -> None:
+        """unsubscribes callback from the data source that was returned by BaseWidget.subscribe"""
+        subscription = next(s for s in self.subscriptions if s[0] is source and s[1] == callback)
+        self.subscriptions.remove(subscription)
+        self.get_data_sources().unsubscribe(source, subscription[2])
+
+    def pause_subscriptions(self) -> None:
+        """stops the widget's subscriptions from being called until they are resumed, see DataSourceManager.pause"""
+        for source, _, instrumented_callback in self.subscriptions:
+            self.get_data_sources().pause(source, instrumented_callback)
+
+    def resume_subscriptions(self) -> None:
+        """calls the widget's subscriptions with the latest data and continues calling them, see DataSourceManager.resume"""
+        for source, _, instrumented_callback in self.subscriptions:
+            self.get_data_sources().resume(source, instrumented_callback)
+
+    def instrument(self, owner, kind: str, func):
+        """returns func wrapped so that its calls are measured as calls of the given kind made by owner, see SmartMirror.instrument"""
+        return self.parent.instrument(owner, kind, func)
+
     def get_colors(self) -> {str: str}:
         """returns the dictionary of colors"""
         return self.parent.get_colors()
@@ -164,10 +242,17 @@ class BaseWidget(tkinter.Frame):
         """returns the dictionary of colors"""
         return self.parent.get_fonts()
 
+    def get_font_registry(self):
+        """returns the FontRegistry of the named fonts shared by the widgets, see FontRegistry"""
+        return self.parent.get_font_registry()
+
     def get_font(self, size="medium"):
-        """returns the font and font size"""
-        fonts = self.get_fonts()
-        return fonts["type"], fonts["sizes"][size]
+        """returns the named font of the size, which is reconfigured in place when the fonts of the config change"""
+        return self.get_font_registry().get_font(size)
+
+    def get_text_font(self, size: str, text: str, width: int, height: int):
+        """returns the font of the size, or if size is "auto", the largest font in which text fits width x height pixels"""
+        return self.get_font_registry().get_text_font(size, text, width, height)
 
     def get_id(self) -> str:
         """if an ID has been defined, returns that ID. If not, it gets a unique ID and saves it, and then returns it"""
@@ -194,6 +279,9 @@ class BaseWidget(tkinter.Frame):
     def update_values(self, *args, **kargs) -> ((), {}):
         """
         Updates the values of the widget. The objects returned will be the parameters of the method call the next time the method is called
+        May be overloaded with an async def, whose coroutine runs on the AsyncLoop's thread so its waits can overlap.
+        It is cancelled if it has not finished when the widget is removed or updated again. Tkinter may only be used
+        through set_options from the coroutine
         :param args:
         :param kargs:
         :return: returns the args, and kargs of the next method call
@@ -203,8 +291,8 @@ class BaseWidget(tkinter.Frame):
         return args, kargs
 
     def place(self, *args, **kargs):
-        """Method that can be overwritten to override placement"""
-        tkinter.Frame.place(self, *args, **kargs)
+        """Method that can be overwritten to override placement, the tkinter widgets should be placed with get_tcl_batch"""
+        self.get_tcl_batch().place(self, *args, **kargs)
 
     def on_click(self, event):
         """Method that can be called to modify click behavior"""
@@ -233,14 +321,20 @@ class BaseWidget(tkinter.Frame):
         Overload this to return file paths of necessary files"""
         return []
 
+    @staticmethod
+    def get_assets(props: {}, rect: ((int, int), (int, int))) -> [(str, (int, int))]:
+        """Returns the image assets the widget displays as (path, (width, height)) pairs,
+        given the widget's props and its rectangle. Overload this so that AssetBaker.py can bake the images"""
+        return []
+
     @staticmethod
     def prop_get(props: {str: str}, prop: str, default, is_acceptable=lambda x: True):
         """Method used to get values from props easier
         Allows default values, as well as checks for acceptable values"""
-        class PropsException(BaseException):
+        class PropsException(Exception):
             pass
         val = props.get(prop, default)
         if is_acceptable(val):
             return val
         else:
-            raise PropsException(f"Property of key {prop} from dictionary {props} with default value of {default} is not one of the accepted values {acceptable_values}")
+            raise PropsException(f"Property of key {prop} from dictionary {props} with default value of {default} has the unacceptable value {val}")
@@ -1,9 +1,8 @@
 """https://developers.google.com/calendar/overview"""
 
 from Widgets.BaseWidget import BaseWidget
+from Widgets.DataSources import CalendarSource
 import pickle
-import datetime
-from googleapiclient.discovery import build
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 
@@ -36,18 +35,17 @@ class CalendarWidget(BaseWidget):
                 pickle.dump(creds, token)
         return creds
 
-    def update_values(self, *args, **kargs) -> ((), {}):
+    def __init__(self, parent, subwidgets=[], constraints=[], props={}):
+        BaseWidget.__init__(self, parent, subwidgets, constraints, props)
+        self.calendar_id = CalendarWidget.prop_get(props, "calendar id", "primary")
+        self.num_events = CalendarWidget.prop_get(props, "num events", 10, lambda x: x > 0)
+        self.subscribe(CalendarSource(self.calendar_id, self.num_events, CalendarWidget.get_credentials), self.on_events)
+
+    def on_events(self, events_result: {}):
         """Shows basic usage of the Google Calendar API.
-        Prints the start and name of the next 10 events on the user's calendar.
+        Prints the start and name of the next events on the user's calendar.
         """
-        service = build('calendar', 'v3', credentials=CalendarWidget.get_credentials())
-
-        # Call the Calendar API
-        now = datetime.datetime.utcnow().isoformat() + 'Z' # 'Z' indicates UTC time
-        print('Getting the upcoming 10 events')
-        events_result = service.events().list(calendarId='primary', timeMin=now,
-                                            maxResults=10, singleEvents=True,
-                                            orderBy='startTime').execute()
+        print(f'Upcoming {self.num_events} events:')
         print(events_result)
         """
         events = events_result.get('items', [])
@@ -58,4 +56,3 @@ class CalendarWidget(BaseWidget):
             start = event['start'].get('dateTime', event['start'].get('date'))
             print(start, event['summary'])
         """
-        return args, kargs
\ No newline at end of file
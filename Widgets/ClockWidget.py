@@ -1,10 +1,24 @@
 from tkinter import Label
 from Widgets.BaseWidget import BaseWidget
-from PIL import ImageTk, Image
-import datetime
+from Widgets.RenderQueue import LazyOption
+from Widgets.AssetCache import AssetCache
+from PIL import ImageTk
 
 
 class ClockWidget(BaseWidget):
+    back_path = "assets/clock_widget/back.png"
+    hours_path = "assets/clock_widget/hours.png"
+    minutes_path = "assets/clock_widget/minutes.png"
+
+    @staticmethod
+    def get_assets(props, rect):
+        """the analog clock displays its images at the size of the largest square that fits in the widget"""
+        (x, y), (width, height) = rect
+        if ClockWidget.prop_get(props, "clock type", "analog") != "analog":
+            return []
+        diameter = min(width, height)
+        return [(path, (diameter, diameter)) for path in [ClockWidget.back_path, ClockWidget.hours_path, ClockWidget.minutes_path]]
+
     def __init__(self, parent, subwidgets=[], constraints=[], props={}):
         BaseWidget.__init__(self, parent, subwidgets, constraints, props)
         self.type = ClockWidget.prop_get(props, "clock type", "analog", lambda x: x in ["digital", "analog"])
@@ -24,14 +38,18 @@ class ClockWidget(BaseWidget):
             self.draw_digital()
         
     def draw_analog(self):
-        back = Image.open("assets/clock_widget/back.png").resize(self.clock_dimensions, Image.ANTIALIAS).convert("RGBA")
-        hours = Image.open("assets/clock_widget/hours.png").resize(self.clock_dimensions, Image.ANTIALIAS).rotate(-0.5*(self.hour*60+self.minute)).convert("RGBA")
-        minutes = Image.open("assets/clock_widget/minutes.png").resize(self.clock_dimensions, Image.ANTIALIAS).rotate(-6*self.minute).convert("RGBA")
+        key = (self.clock_dimensions, self.hour, self.minute)
+        self.set_options(self.clock_label, image=LazyOption(key, lambda: ClockWidget.get_analog_image(*key)))
+        self.get_tcl_batch().pack(self.clock_label)
+
+    @staticmethod
+    def get_analog_image(clock_dimensions, hour, minute):
+        back = AssetCache.load(ClockWidget.back_path, clock_dimensions).copy()
+        hours = AssetCache.load(ClockWidget.hours_path, clock_dimensions).rotate(-0.5*(hour*60+minute))
+        minutes = AssetCache.load(ClockWidget.minutes_path, clock_dimensions).rotate(-6*minute)
         back.paste(hours, (0,0), hours)
         back.paste(minutes, (0,0), minutes)
-        self.clock_label.photo_ref = ImageTk.PhotoImage(back)
-        self.clock_label.config(image=self.clock_label.photo_ref)
-        self.clock_label.pack()
+        return ImageTk.PhotoImage(back)
 
     def draw_digital(self):
         pass
@@ -44,5 +62,5 @@ class ClockWidget(BaseWidget):
             self.clock_dimensions = (self.width, self.height)
 
     def update_values(self):
-        now = datetime.datetime.now()
+        now = self.get_time()
         self.hour, self.minute, self.seconds = now.hour, now.minute, now.second
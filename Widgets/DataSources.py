@@ -0,0 +1,274 @@
+import urllib.error
+import urllib.request
+import json
+import datetime
+import io
+from PIL import Image
+
+
+class DataSource:
+    """
+    A named source of data that widgets subscribe to
+    Sources with the same key are the same source, so widgets that subscribe to equal sources share every fetch
+    Methods that should be overwritten:
+        get_key
+        fetch
+        simulate
+    Methods that can be overwritten:
+        join
+        resume_subscriber
+    """
+
+    # static sources fetch data that never changes, so they are only fetched once regardless of the update times
+    static = False
+    # if set, the requests of the source are recorded or replayed by this NetworkArchive, see DataSourceManager.add_source
+    network_archive = None
+
+    def __init__(self):
+        """creates a source with no subscribers that has not fetched any data yet"""
+        self.subscribers: {callable: int} = {}
+        self.paused: {callable} = set()
+        self.data = None
+        self.fetch_count = 0
+        # data kept between fetches, replaced by the cache shared by the sources of the same type, see DataSourceManager.add_source
+        self.cache: {} = {}
+
+    #######################
+    # Methods to Overload #
+    #######################
+
+    def get_key(self) -> tuple:
+        """returns the key that identifies the data this source fetches"""
+        return type(self).__name__,
+
+    def fetch(self):
+        """fetches and returns the source's data"""
+        return None
+
+    def simulate(self, now: datetime.datetime):
+        """returns data in the same format as fetch without accessing the network, used to simulate the mirror"""
+        return None
+
+    def join(self, other, callback) -> bool:
+        """
+        called when callback subscribes to this source through other, an equal source, so that sources that fetch
+        the data of several subscribers together can add the data other describes
+
+        :return: True if the source must be fetched again for callback to get its data
+        """
+        return False
+
+    ###########################
+    # Subscription Management #
+    ###########################
+
+    def add_subscriber(self, callback, update_time: int = None) -> None:
+        """
+        adds callback to the functions called with the data every time it is fetched
+
+        :param update_time: time in milliseconds between updates that the subscriber needs.
+            None if the subscriber only needs the data once
+        """
+        self.subscribers[callback] = update_time
+
+    def remove_subscriber(self, callback) -> None:
+        """removes callback from the functions called with the data"""
+        self.subscribers.pop(callback, None)
+        self.paused.discard(callback)
+
+    def pause_subscriber(self, callback) -> None:
+        """stops calling callback with the data, and ignores its update time, until it is resumed"""
+        self.paused.add(callback)
+
+    def resume_subscriber(self, callback) -> bool:
+        """
+        calls callback with the data again every time it is fetched
+
+        :return: True if the source must be fetched again for callback to get its data, see DataSource.join
+        """
+        self.paused.discard(callback)
+        return False
+
+    def get_update_time(self) -> int:
+        """returns the shortest update time of the subscribers, or None if none of them need repeated updates"""
+        if self.static:
+            return None
+        return min((t for callback, t in self.subscribers.items() if t is not None and callback not in self.paused), default=None)
+
+    def get_url(self, url: str) -> bytes:
+        """returns the content at url, recorded or replayed by the network archive if there is one"""
+        if self.network_archive is not None:
+            return self.network_archive.urlopen(url)
+        with urllib.request.urlopen(url) as response:
+            return response.read()
+
+    def update(self) -> None:
+        """
+        fetches the data and passes it to every subscriber
+        if the fetch fails, the subscribers keep the previous data until the next fetch
+        """
+        try:
+            self.data = self.fetch()
+        except Exception as e:
+            print(f"Source {self.get_key()} could not be fetched:\n\t{type(e).__name__}: {e}")
+            return
+        self.fetch_count += 1
+        for callback in list(self.subscribers):
+            if callback not in self.paused:
+                callback(self.data)
+
+    def __str__(self) -> str:
+        """gives the source's key and the update time it is fetched at"""
+        return f"{self.get_key()} every {self.get_update_time()} ms for {len(self.subscribers)} subscribers ({len(self.paused)} paused)"
+
+
+class WeatherSource(DataSource):
+    """
+    Current weather of locations from https://openweathermap.org/current
+    Every subscriber with the same API key shares one source, which fetches the locations of all its subscribers together with
+    https://openweathermap.org/current#severalid in requests of up to group_size cities, so the number of requests
+    stays the same as locations are added. The zip code of each location is resolved to its city id once, and kept in the cache
+    The data maps each (zip code, country code) location to its weather. Locations whose request fails keep their previous
+    weather, and locations that could not be resolved are not resolved again for a number of fetches that doubles with each failure
+    """
+    query_base = "https://api.openweathermap.org/data/2.5/weather?zip={},{}&APPID={}"
+    group_query_base = "https://api.openweathermap.org/data/2.5/group?id={}&APPID={}"
+    group_size = 20
+    # most fetches that a location that could not be resolved is skipped for
+    max_backoff = 64
+
+    def __init__(self, zip_code, country_code: str, api_key: str):
+        """creates a source for the weather of the location, which is added to the shared source when it is subscribed to"""
+        DataSource.__init__(self)
+        self.location = (str(zip_code), country_code)
+        self.api_key = api_key
+        self.subscriber_locations: {callable: (str, str)} = {}
+        self.attempts = 0
+        # number of failures of each location that could not be resolved and the attempt at which it is resolved again
+        self.failed_locations: {(str, str): (int, int)} = {}
+
+    def get_key(self) -> tuple:
+        return "weather", self.api_key
+
+    def join(self, other, callback) -> bool:
+        self.subscriber_locations[callback] = other.location
+        return self.data is not None and other.location not in self.data
+
+    def remove_subscriber(self, callback) -> None:
+        DataSource.remove_subscriber(self, callback)
+        self.subscriber_locations.pop(callback, None)
+
+    def resume_subscriber(self, callback) -> bool:
+        # the locations of paused subscribers are not fetched, so the location of callback may be missing from the data
+        DataSource.resume_subscriber(self, callback)
+        return self.data is not None and self.subscriber_locations.get(callback, None) not in self.data
+
+    def get_locations(self) -> [(str, str)]:
+        """returns the locations of the subscribers that are not paused"""
+        return sorted({location for callback, location in self.subscriber_locations.items() if callback not in self.paused})
+
+    def get_json(self, url: str) -> {}:
+        """returns the json object at url"""
+        return json.loads(self.get_url(url).decode(encoding="utf-8"))
+
+    def resolve(self, location: (str, str)) -> {}:
+        """
+        resolves the city id of the location and returns its weather, since the request that resolves it returns it as well
+        returns None if the location could not be resolved, or if it failed to be resolved too recently to be tried again
+        """
+        failures, retry_attempt = self.failed_locations.get(location, (0, 0))
+        if self.attempts < retry_attempt:
+            return None
+        try:
+            weather = self.get_json(WeatherSource.query_base.format(*location, self.api_key))
+            self.cache[location] = weather["id"]
+        except (urllib.error.URLError, ValueError, KeyError) as e:
+            backoff = min(2 ** failures, WeatherSource.max_backoff)
+            self.failed_locations[location] = (failures + 1, self.attempts + backoff)
+            print(f"Weather location {location} could not be resolved, trying again in {backoff} fetches:\n\t{type(e).__name__}: {e}")
+            return None
+        self.failed_locations.pop(location, None)
+        return weather
+
+    def fetch(self) -> {(str, str): {}}:
+        self.attempts += 1
+        data = {}
+        for location in self.get_locations():
+            if location not in self.cache:
+                weather = self.resolve(location)
+                if weather is not None:
+                    data[location] = weather
+        locations = [location for location in self.get_locations() if location in self.cache and location not in data]
+        city_ids = sorted({self.cache[location] for location in locations})
+        weather = {}
+        for i in range(0, len(city_ids), WeatherSource.group_size):
+            group = ",".join(map(str, city_ids[i:i + WeatherSource.group_size]))
+            try:
+                weather.update((city["id"], city) for city in self.get_json(WeatherSource.group_query_base.format(group, self.api_key))["list"])
+            except (urllib.error.URLError, ValueError, KeyError) as e:
+                print(f"Weather of the cities {group} could not be fetched:\n\t{type(e).__name__}: {e}")
+        data.update((location, weather[self.cache[location]]) for location in locations if self.cache[location] in weather)
+        # locations whose request failed keep their previous weather
+        if self.data is not None:
+            data.update((location, self.data[location]) for location in self.get_locations() if location not in data and location in self.data)
+        return data
+
+    def simulate(self, now: datetime.datetime) -> {(str, str): {}}:
+        # temperature is warmest in the afternoon, and the icon changes between day and night
+        temp = 288.15 - 5 * abs(now.hour + now.minute / 60 - 15) / 12
+        icon = "01d" if 6 <= now.hour < 18 else "01n"
+        return {location: {"name": f"Simulated City {location[0]}", "main": {"temp": temp}, "weather": [{"icon": icon}]}
+                for location in self.get_locations()}
+
+
+class IconSource(DataSource):
+    """
+    Image at a url, such as the weather icons from https://openweathermap.org/weather-conditions
+    Images are kept in the cache after their last subscriber unsubscribes, so each url is only fetched once
+    """
+    static = True
+
+    def __init__(self, url: str):
+        DataSource.__init__(self)
+        self.url = url
+
+    def get_key(self) -> tuple:
+        return "icon", self.url
+
+    def fetch(self):
+        if self.url not in self.cache:
+            self.cache[self.url] = Image.open(io.BytesIO(self.get_url(self.url)))
+        return self.cache[self.url]
+
+    def simulate(self, now: datetime.datetime):
+        return Image.new("RGBA", (100, 100))
+
+
+class CalendarSource(DataSource):
+    """Upcoming events of a Google Calendar from https://developers.google.com/calendar/overview"""
+
+    def __init__(self, calendar_id: str, max_results: int, get_credentials):
+        """
+        :param get_credentials: function that takes no parameters and returns credentials for the Google Calendar API
+        """
+        DataSource.__init__(self)
+        self.calendar_id = calendar_id
+        self.max_results = max_results
+        self.get_credentials = get_credentials
+
+    def get_key(self) -> tuple:
+        return "calendar", self.calendar_id, self.max_results
+
+    def fetch(self) -> {}:
+        from googleapiclient.discovery import build
+        if self.network_archive is None:
+            service = build('calendar', 'v3', credentials=self.get_credentials())
+        else:
+            service = build('calendar', 'v3', http=self.network_archive.get_http(self.get_credentials))
+        now = datetime.datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
+        return service.events().list(calendarId=self.calendar_id, timeMin=now,
+                                     maxResults=self.max_results, singleEvents=True,
+                                     orderBy='startTime').execute()
+
+    def simulate(self, now: datetime.datetime) -> {}:
+        return {"items": []}
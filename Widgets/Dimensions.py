@@ -214,13 +214,25 @@ class Constraint:
         """Is used to determine the px size of a Size object"""
         return self.layout_manager.to_px(size)
 
+    def get_widget_id(self, identifier) -> str:
+        """returns the id of the widget that the identifier represents, resolving "self" and "parent"
+        returns None if the widget has no parent widget"""
+        if identifier == "self":
+            return self.obj
+        elif identifier == "parent":
+            parent = self.layout_manager.get_widget(self.obj).parent
+            return parent.get_id() if hasattr(parent, "get_id") else None
+        else:
+            return identifier
+
     def get_dependents(self):
         """yields keys of possible dependent constraints that should be evaluated
         before this Constraint has been evaluated"""
         for expression in self.expressions:
             if expression.obj is not None and expression.prop is not None:
+                widget_id = self.get_widget_id(expression.obj)
                 for dim in Constraint.x_dimensions if expression.prop in Constraint.x_dimensions else Constraint.y_dimensions if expression.prop in Constraint.y_dimensions else []:
-                    yield expression.obj, dim
+                    yield widget_id, dim
         return StopIteration
 
     def evaluate(self) -> (('BaseWidget', str), int):
@@ -0,0 +1,118 @@
+from collections import OrderedDict
+import tkinter
+import tkinter.font
+
+
+class FontRegistry:
+    """
+    Named fonts shared by every widget, built from the "fonts" section of the config
+    Tk resolves a named font once, and widgets that display a named font are redrawn when the font is reconfigured,
+    so changing the fonts of the config reconfigures the fonts in place instead of reconstructing the widgets
+
+    Also fits text to a rectangle: the size "auto" picks the largest size whose measured text fits the width and height
+    Measurements are memoized by (family, size, text), so fitting text that was fitted before does not measure it again
+    """
+    max_measurements = 4096
+
+    def __init__(self, window: tkinter.Tk, fonts: {}):
+        """
+        Initializes a FontRegistry without fonts. Fonts are created when they are first used
+
+        :param window: the tkinter window whose interpreter the fonts are created in
+        :param fonts: see FontRegistry.set_config
+        """
+        self.window = window
+        self.family: str = None
+        self.sizes: {str: int} = {}
+        self.named_fonts: {str: tkinter.font.Font} = {}
+        self.fitted_fonts: {int: tkinter.font.Font} = {}
+        self.measurements: OrderedDict = OrderedDict()
+        self.fits: OrderedDict = OrderedDict()
+        self.measure_count = 0
+        self.set_config(fonts)
+
+    def set_config(self, fonts: {}) -> None:
+        """
+        reconfigures the fonts that were created in place, so the widgets that display them are redrawn with the new fonts
+        fitted fonts get the new family but keep their point size, which was fitted to the old family, so widgets should
+        fit their text again when the family changed, see SmartMirror.apply_diff
+
+        :param fonts: should be in the format {"type": family, "sizes": {"medium": 14, ...}}
+        """
+        self.family = fonts["type"]
+        self.sizes = fonts["sizes"]
+        for size, font in self.named_fonts.items():
+            if size in self.sizes:
+                font.configure(family=self.family, size=self.sizes[size])
+        for size, font in self.fitted_fonts.items():
+            font.configure(family=self.family)
+        self.fits.clear()
+
+    #########
+    # Fonts #
+    #########
+
+    def get_font(self, size: str = "medium") -> tkinter.font.Font:
+        """returns the named font of the size in the config, such as "medium" or "huge" """
+        assert size in self.sizes, f"Font size {size} is not one of the sizes in the config {list(self.sizes)}"
+        if size not in self.named_fonts:
+            self.named_fonts[size] = tkinter.font.Font(root=self.window, name=f"mirror_{size}", family=self.family, size=self.sizes[size])
+        return self.named_fonts[size]
+
+    def get_fitted_font(self, size: int) -> tkinter.font.Font:
+        """returns the named font of the family in the config with the point size"""
+        if size not in self.fitted_fonts:
+            self.fitted_fonts[size] = tkinter.font.Font(root=self.window, name=f"mirror_{size}pt", family=self.family, size=size)
+        return self.fitted_fonts[size]
+
+    def get_text_font(self, size: str, text: str, width: int, height: int) -> tkinter.font.Font:
+        """returns the font of the size in the config, or if size is "auto", the largest font in which text fits width x height pixels"""
+        if size == "auto":
+            return self.fit(text, width, height)
+        return self.get_font(size)
+
+    ################
+    # Fitting Text #
+    ################
+
+    def fit(self, text: str, width: int, height: int) -> tkinter.font.Font:
+        """
+        returns the font with the largest point size in which text fits width x height pixels, or the font with
+        point size 1 if the text does not fit at all
+        """
+        key = (self.family, text, width, height)
+        if key not in self.fits:
+            # a size larger than the height in pixels can not fit, since a point is at least a pixel on screens
+            low, high = 1, max(1, height)
+            while low < high:
+                size = (low + high + 1) // 2
+                text_width, text_height = self.measure(text, size)
+                if text_width <= width and text_height <= height:
+                    low = size
+                else:
+                    high = size - 1
+            FontRegistry.remember(self.fits, key, low)
+        return self.get_fitted_font(self.fits[key])
+
+    def measure(self, text: str, size: int) -> (int, int):
+        """returns the width and height in pixels of text in the family of the config at the point size"""
+        key = (self.family, size, text)
+        if key not in self.measurements:
+            self.measure_count += 1
+            font = (self.family, size)
+            lines = str(text).split("\n")
+            line_height = int(self.window.tk.call("font", "metrics", font, "-linespace"))
+            text_width = max(int(self.window.tk.call("font", "measure", font, line)) for line in lines)
+            FontRegistry.remember(self.measurements, key, (text_width, line_height * len(lines)))
+        return self.measurements[key]
+
+    @staticmethod
+    def remember(cache: OrderedDict, key, value) -> None:
+        """adds the value to the cache, forgetting the oldest value once the cache holds max_measurements values"""
+        cache[key] = value
+        if len(cache) > FontRegistry.max_measurements:
+            cache.popitem(last=False)
+
+    def __str__(self) -> str:
+        """gives the fonts created and the number of measurements made"""
+        return f"FontRegistry: family = {self.family}, named fonts = {list(self.named_fonts)}, fitted sizes = {sorted(self.fitted_fonts)}, {self.measure_count} measurements, {len(self.measurements)} memoized"
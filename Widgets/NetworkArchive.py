@@ -0,0 +1,143 @@
+from collections import defaultdict
+import base64
+import hashlib
+import json
+import pathlib
+import random
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+class NetworkArchive:
+    """
+    Records the requests that data sources make and their responses into an archive directory, and replays them,
+    so that the mirror runs reproducibly on a machine without a network
+    The responses of a request are stored in a JSON lines file, one response per line, so recording a response
+    appends a line instead of rewriting the responses recorded before
+    Requests are matched by their method, url and body. The query parameters in ignored_params are left out of the match
+    When replayed, a request is answered with its recorded responses in the order they were recorded, starting over once
+    they run out, after the latency and with the chance of an error given in the config
+    """
+
+    # query parameters that change on every request, or that are secret and should not be written to the archive
+    ignored_params = ["APPID", "timeMin"]
+
+    def __init__(self, archive_config: {}):
+        """
+        :param archive_config: the "network archive" section of the config, in the format
+            {"mode": "record" or "replay", "path": directory, "latency": ms, "error rate": float, "seed": int}
+            where every key except mode is optional
+        """
+        self.mode = archive_config["mode"]
+        assert self.mode in ["record", "replay"], f"Network archive mode {self.mode} is not one of record, replay"
+        self.path = pathlib.Path(archive_config.get("path", "archive"))
+        self.latency = archive_config.get("latency", 0)
+        self.error_rate = archive_config.get("error rate", 0)
+        self.random = random.Random(archive_config.get("seed", 0))
+        self.archives: {str: {}} = {}
+        self.replayed: {str: int} = defaultdict(int)
+
+    @staticmethod
+    def get_key(method: str, url: str, body: bytes or str = None) -> str:
+        """returns the key that a request is recorded under"""
+        scheme, netloc, path, query, _ = urllib.parse.urlsplit(url)
+        params = [(k, v) for k, v in urllib.parse.parse_qsl(query, keep_blank_values=True) if k not in NetworkArchive.ignored_params]
+        key = f"{method} {urllib.parse.urlunsplit((scheme, netloc, path, urllib.parse.urlencode(sorted(params)), ''))}"
+        if body is None:
+            return key
+        return f"{key} {hashlib.sha1(body.encode() if isinstance(body, str) else body).hexdigest()}"
+
+    def get_archive_path(self, key: str) -> pathlib.Path:
+        """returns the path of the file that the responses of the key are recorded in"""
+        return self.path / f"{hashlib.sha1(key.encode()).hexdigest()}.jsonl"
+
+    def get_archive(self, key: str) -> {}:
+        """returns the request and the recorded responses of the key, which are read from the archive directory once"""
+        if key not in self.archives:
+            archive_path = self.get_archive_path(key)
+            responses = []
+            if archive_path.exists():
+                with archive_path.open() as file:
+                    responses = [json.loads(line) for line in file if line.strip()]
+            self.archives[key] = {"request": key, "responses": responses}
+        return self.archives[key]
+
+    def record(self, key: str, response: {}) -> None:
+        """adds the response to the recorded responses of the key and appends it to the key's file"""
+        self.get_archive(key)["responses"].append(response)
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self.get_archive_path(key).open("a") as file:
+            file.write(json.dumps(dict(response, request=key)) + "\n")
+
+    def request(self, method: str, url: str, body, send) -> (int, {str: str}, bytes):
+        """
+        records or replays a request
+
+        :param send: function that takes no parameters, makes the request and returns its (status, headers, content)
+            it is only called when recording
+        :return: the (status, headers, content) of the response
+        """
+        key = NetworkArchive.get_key(method, url, body)
+        archive = self.get_archive(key)
+        if self.mode == "record":
+            status, headers, content = send()
+            self.record(key, {"status": status, "headers": headers, "content": base64.b64encode(content).decode("ascii")})
+            return status, headers, content
+        time.sleep(self.latency / 1000)
+        if self.random.random() < self.error_rate:
+            raise urllib.error.URLError(f"Simulated error for {key}")
+        if not archive["responses"]:
+            raise urllib.error.URLError(f"No recorded response for {key} in {self.path}")
+        response = archive["responses"][self.replayed[key] % len(archive["responses"])]
+        self.replayed[key] += 1
+        return response["status"], response["headers"], base64.b64decode(response["content"])
+
+    def urlopen(self, url: str) -> bytes:
+        """returns the content at url like urllib.request.urlopen, recorded or replayed"""
+        def send():
+            with urllib.request.urlopen(url) as response:
+                return response.status, dict(response.headers), response.read()
+        return self.request("GET", url, None, send)[2]
+
+    def get_http(self, get_credentials):
+        """
+        returns the http object used by the Google API client (see googleapiclient.discovery.build) to make its requests
+        requests are authorized with the credentials when recording, and replayed without credentials
+
+        :param get_credentials: function that takes no parameters and returns credentials for the Google API
+        """
+        if self.mode == "record":
+            from google_auth_httplib2 import AuthorizedHttp
+            return AuthorizedHttp(get_credentials(), http=ArchivedHttp(self))
+        return ArchivedHttp(self)
+
+    def __str__(self) -> str:
+        """gives the archive's mode and directory"""
+        return f"NetworkArchive: mode = {self.mode}, path = {self.path}, latency = {self.latency} ms, error rate = {self.error_rate}"
+
+
+class ArchivedHttp:
+    """Stands in for httplib2.Http so that the requests of the Google API client are recorded or replayed by a NetworkArchive"""
+
+    def __init__(self, archive: NetworkArchive):
+        import httplib2
+        self.archive = archive
+        self.http = httplib2.Http() if archive.mode == "record" else None
+        self.timeout = None
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        """see httplib2.Http.request"""
+        import httplib2
+
+        def send():
+            response, content = self.http.request(uri, method, body=body, headers=headers, redirections=redirections, connection_type=connection_type)
+            return response.status, dict(response), content
+        status, response_headers, content = self.archive.request(method, uri, body, send)
+        return httplib2.Response(dict(response_headers, status=str(status))), content
+
+    def close(self) -> None:
+        """see httplib2.Http.close"""
+        if self.http is not None:
+            self.http.close()
@@ -0,0 +1,92 @@
+import tkinter
+import weakref
+
+
+class LazyOption:
+    """
+    An option value that is only constructed when it is applied to a tkinter widget
+    LazyOptions are equal when their keys are equal, so the value is only constructed again when its key changes
+    Used for values that are expensive to construct such as images
+    """
+
+    def __init__(self, key, factory):
+        """
+        :param key: describes the value, such that two values with equal keys would look the same
+        :param factory: function that takes no parameters and returns the value
+        """
+        self.key = key
+        self.factory = factory
+
+    def construct(self):
+        """returns the value that the option should be set to"""
+        return self.factory()
+
+    def __eq__(self, other):
+        """LazyOptions are equal if their keys are equal"""
+        if isinstance(other, LazyOption):
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __str__(self):
+        return f"LazyOption({self.key})"
+
+
+class RenderQueue:
+    """
+    Class used to apply the options that widgets want their tkinter widgets to have
+    Options are compared with the options that were last applied, and only the changed options are applied
+    Changes are collected and applied together once per frame, when the window is next idle
+    """
+
+    def __init__(self, scheduler: tkinter.Tk, tcl_batch):
+        """
+        Initializes a RenderQueue
+
+        :param scheduler: the tkinter window, or any object with the method after_idle used to schedule the flushes
+        :param tcl_batch: the TclBatch that the options of a flush are applied through as one Tcl script
+        """
+        self.scheduler = scheduler
+        self.tcl_batch = tcl_batch
+        self.applied: {tkinter.Misc: {str: object}} = weakref.WeakKeyDictionary()
+        self.references: {tkinter.Misc: {str: object}} = weakref.WeakKeyDictionary()
+        self.pending: {tkinter.Misc: {str: object}} = {}
+        self.scheduled = None
+        self.applied_count = 0
+        self.skipped_count = 0
+
+    def set(self, tk_widget: tkinter.Misc, **options) -> None:
+        """
+        sets the options that tk_widget should have
+        options equal to the ones already applied are ignored, and the others are applied when the queue is flushed
+        """
+        applied = self.applied.get(tk_widget, {})
+        pending = self.pending.setdefault(tk_widget, {})
+        for option, value in options.items():
+            if option in applied and applied[option] == value:
+                pending.pop(option, None)
+                self.skipped_count += 1
+            else:
+                pending[option] = value
+        if not pending:
+            del self.pending[tk_widget]
+        elif self.scheduled is None:
+            self.scheduled = self.scheduler.after_idle(self.flush)
+
+    def flush(self) -> None:
+        """
+        applies all the pending options, configuring each tkinter widget once
+        the options of every widget are applied together as one Tcl script, which skips widgets that were destroyed
+        """
+        self.scheduled = None
+        pending, self.pending = self.pending, {}
+        with self.tcl_batch:
+            for tk_widget, options in pending.items():
+                values = {option: value.construct() if isinstance(value, LazyOption) else value for option, value in options.items()}
+                self.tcl_batch.configure(tk_widget, **values)
+                self.applied.setdefault(tk_widget, {}).update(options)
+                # tkinter does not keep references to images, so they are kept here for as long as they are displayed
+                self.references.setdefault(tk_widget, {}).update(values)
+                self.applied_count += len(options)
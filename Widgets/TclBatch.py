@@ -0,0 +1,98 @@
+import tkinter
+
+
+class TclBatch:
+    """
+    Collects the geometry (place, grid, pack) and configure commands of tkinter widgets during a pass,
+    such as a layout pass or a RenderQueue flush, and evaluates them as one Tcl script when the pass ends
+    Each tkinter method call is a separate round trip between Python and Tcl, so with many widgets a single script is faster
+    Commands that are given outside of a pass are evaluated immediately
+    """
+
+    def __init__(self, window: tkinter.Tk):
+        """
+        Initializes a TclBatch with no commands
+
+        :param window: the tkinter window whose interpreter evaluates the scripts
+        """
+        self.window = window
+        self.commands: [str] = []
+        self.depth = 0
+        self.script_count = 0
+        self.command_count = 0
+
+    def __enter__(self):
+        """begins a pass. Passes may be nested, in which case the commands are evaluated when the outermost pass ends"""
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """ends a pass, evaluating its commands if it is the outermost pass"""
+        self.depth -= 1
+        if self.depth == 0:
+            self.flush()
+
+    ############
+    # Commands #
+    ############
+
+    def place(self, tk_widget: tkinter.Misc, cnf: {} = {}, **options) -> None:
+        """see tkinter.Place.place_configure"""
+        self.add(["place", "configure", tk_widget._w] + TclBatch.get_option_words(tk_widget, cnf, options))
+
+    def grid(self, tk_widget: tkinter.Misc, cnf: {} = {}, **options) -> None:
+        """see tkinter.Grid.grid_configure"""
+        self.add(["grid", "configure", tk_widget._w] + TclBatch.get_option_words(tk_widget, cnf, options))
+
+    def pack(self, tk_widget: tkinter.Misc, cnf: {} = {}, **options) -> None:
+        """see tkinter.Pack.pack_configure"""
+        self.add(["pack", "configure", tk_widget._w] + TclBatch.get_option_words(tk_widget, cnf, options))
+
+    def configure(self, tk_widget: tkinter.Misc, cnf: {} = {}, **options) -> None:
+        """see tkinter.Misc.configure"""
+        self.add([tk_widget._w, "configure"] + TclBatch.get_option_words(tk_widget, cnf, options))
+
+    def add(self, words: []) -> None:
+        """adds the command made of words to the pass, or evaluates it if no pass has begun"""
+        self.commands.append(" ".join(map(TclBatch.quote, words)))
+        if self.depth == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        evaluates the commands as one script
+        each command is caught in the script, so a failing command, such as one for a widget that was destroyed before
+        the pass ended, is skipped without stopping the commands after it or evaluating the ones before it again
+        """
+        commands, self.commands = self.commands, []
+        if not commands:
+            return
+        self.script_count += 1
+        self.command_count += len(commands)
+        self.window.tk.eval("\n".join(f"catch {{{command}}}" for command in commands))
+
+    ##################
+    # Helper Methods #
+    ##################
+
+    @staticmethod
+    def get_option_words(tk_widget: tkinter.Misc, cnf: {}, options: {}) -> []:
+        """returns the -option value words of the options like tkinter does, which registers callbacks as Tcl commands"""
+        return list(tk_widget._options(cnf, options))
+
+    @staticmethod
+    def quote(value) -> str:
+        """
+        returns value as a single Tcl word
+        tuples and lists become Tcl lists, and other values are converted like tkinter does, such as images to their names
+        """
+        if isinstance(value, (tuple, list)):
+            value = " ".join(map(TclBatch.quote, value))
+        value = str(value)
+        if value == "":
+            return "{}"
+        return "".join("\\" + c if c in "\\[]{}$\"; \t\r\v\f" else "\\n" if c == "\n" else c for c in value)
+
+    def __str__(self) -> str:
+        """gives the number of scripts and commands evaluated"""
+        return f"TclBatch: {self.command_count} commands in {self.script_count} scripts, {len(self.commands)} pending"
@@ -1,15 +1,14 @@
 from tkinter import Label
 from Widgets.BaseWidget import BaseWidget
-import urllib.request
-import json
-from PIL import ImageTk, Image
+from Widgets.DataSources import WeatherSource, IconSource
+from Widgets.RenderQueue import LazyOption
+from PIL import ImageTk
 
 
 class WeatherWidget(BaseWidget):
-    query_base = "https://api.openweathermap.org/data/2.5/weather?zip={},{}&APPID={}"
     img_link = "http://openweathermap.org/img/wn/{}@2x.png"
     api_key_path = "config/OpenWeatherAPI/OpenWeatherAPIKey.txt"
-    font = ("Helvetica", 14)
+    icon_height = 100
 
     @staticmethod
     def get_necessary_config():
@@ -28,32 +27,67 @@ class WeatherWidget(BaseWidget):
         self.country_code = WeatherWidget.prop_get(props, "country code", "us")
         self.units = WeatherWidget.prop_get(props, "temperature units", "celsius", lambda x: x in ["celsius", "fahrenheit"])
         self.rounding = WeatherWidget.prop_get(props, "rounding", 0, lambda x: x >= 0)
+        is_font_size = lambda x: x == "auto" or x in self.get_fonts()["sizes"]
+        self.city_font = WeatherWidget.prop_get(props, "city font", "Large", is_font_size)
+        self.temp_font = WeatherWidget.prop_get(props, "temperature font", "huge", is_font_size)
         self.api_key = WeatherWidget.get_api_key_from_file()
+        self.location = (str(self.zip_code), self.country_code)
         self.data = {}
+        self.icon_source = None
+        # rect and font family that the text in "auto" fonts was last fitted to
+        self.fitted_key = None
 
-        self.city_label = Label(self, font=self.get_font("Large"), bg=self.get_bg(), fg=self.get_fg())
+        self.city_label = Label(self, font=self.get_text_font(self.city_font, "", *self.get_text_size()), bg=self.get_bg(), fg=self.get_fg())
         self.icon_label = Label(self, bg=self.get_bg(), fg=self.get_fg())
-        self.temp_label = Label(self, font=self.get_font("huge"), bg=self.get_bg(), fg=self.get_fg())
-        self.update_values()
+        self.temp_label = Label(self, font=self.get_text_font(self.temp_font, "", *self.get_text_size()), bg=self.get_bg(), fg=self.get_fg())
+        self.subscribe(WeatherSource(self.zip_code, self.country_code, self.api_key), self.on_weather)
 
     def place(self, *args, **kargs):
         BaseWidget.place(self, *args, **kargs)
-        self.city_label.grid(row=0)
-        self.icon_label.grid(row=1)
-        self.temp_label.grid(row=2)
+        self.get_tcl_batch().grid(self.city_label, row=0)
+        self.get_tcl_batch().grid(self.icon_label, row=1)
+        self.get_tcl_batch().grid(self.temp_label, row=2)
+        if self.data and "auto" in (self.city_font, self.temp_font) and self.get_fit_key() != self.fitted_key:
+            self.update_labels()
 
-    def update_values(self, *args, **kargs) -> ((), {}):
-        url = WeatherWidget.query_base.format(self.zip_code, self.country_code, self.api_key)
-        with urllib.request.urlopen(url) as response:
-            self.data = json.loads(response.read().decode(encoding="utf-8"))
-        self.update_labels()
-        return args, kargs
+    def on_weather(self, data: {(str, str): {}}):
+        """
+        called with the weather of every location each time the weather source is fetched
+        the labels keep their values until the weather of the widget's location is fetched
+        """
+        if self.location in data:
+            self.data = data[self.location]
+            self.update_labels()
 
     def update_labels(self):
-        self.city_label.config(text=self.data.get("name", "City not found in recieved data"))
-        self.temp_label.config(text=round(self.convert_temperature(self.data.get("main", {"temp": 0}).get("temp", 0)), self.rounding))   # defaults to 0 kelvin
-        self.icon_label.photo_ref = ImageTk.PhotoImage(self.get_icon())
-        self.icon_label.config(image=self.icon_label.photo_ref)
+        city = self.data.get("name", "City not found in recieved data")
+        temp = str(round(self.convert_temperature(self.data.get("main", {"temp": 0}).get("temp", 0)), self.rounding))   # defaults to 0 kelvin
+        self.set_options(self.city_label, text=city, font=self.get_text_font(self.city_font, city, *self.get_text_size()))
+        self.set_options(self.temp_label, text=temp, font=self.get_text_font(self.temp_font, temp, *self.get_text_size()))
+        self.fitted_key = self.get_fit_key()
+        self.update_icon_source()
+
+    def get_fit_key(self) -> tuple:
+        """returns the rect and font family that text in "auto" fonts is fitted to, the text is fitted again when they change"""
+        return self.get_rect(), self.get_font_registry().family
+
+    def get_text_size(self) -> (int, int):
+        """returns the width and height in pixels that the city and the temperature can each take up below and above the icon"""
+        _, (width, height) = self.get_rect()
+        return width, max(1, (height - WeatherWidget.icon_height) // 2)
+
+    def update_icon_source(self):
+        """subscribes to the icon that represents the current weather, if it is not subscribed to already"""
+        url = WeatherWidget.img_link.format(self.get_icon_id())
+        if self.icon_source is not None:
+            if self.icon_source.url == url:
+                return
+            self.unsubscribe(self.icon_source, self.on_icon)
+        self.icon_source = self.subscribe(IconSource(url), self.on_icon)
+
+    def on_icon(self, icon):
+        """called with the icon's image once it is fetched"""
+        self.set_options(self.icon_label, image=LazyOption(self.get_icon_id(), lambda: ImageTk.PhotoImage(icon)))
 
     def convert_temperature(self, num, to=None):
         if to is None:
@@ -63,9 +97,7 @@ class WeatherWidget(BaseWidget):
         else:
             return self.convert_temperature(num, to="celsius") * 9/5 + 32
 
-    def get_icon(self):
-        """ gets an icon that represents the weather from the API provider
+    def get_icon_id(self) -> str:
+        """returns the id of the icon that represents the weather
         https://openweathermap.org/weather-conditions"""
-        icon_id = self.data.get("weather", [{"icon": "01d"}])[0].get("icon", "01d")     # defaults to clear day icon
-        with urllib.request.urlopen(WeatherWidget.img_link.format(icon_id)) as response:
-            return Image.open(response)
+        return self.data.get("weather", [{"icon": "01d"}])[0].get("icon", "01d")     # defaults to clear day icon